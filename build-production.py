@@ -6,11 +6,66 @@ Builds the React frontend and configures FastAPI to serve it
 
 import os
 import sys
-import subprocess
+import asyncio
+import hashlib
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def build_frontend():
+def _tree_manifest(root):
+    """Map each file under root (relative path) to its (mtime_ns, size)"""
+    manifest = {}
+    if not os.path.isdir(root):
+        return manifest
+    
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    stat = entry.stat()
+                    manifest[os.path.relpath(entry.path, root)] = (stat.st_mtime_ns, stat.st_size)
+    return manifest
+
+def _sync_tree(src, dst, workers=8):
+    """Mirror src into dst, copying only new/changed files and deleting removed ones"""
+    src_manifest = _tree_manifest(src)
+    dst_manifest = _tree_manifest(dst)
+    
+    changed = [rel for rel, meta in src_manifest.items() if dst_manifest.get(rel) != meta]
+    removed = dst_manifest.keys() - src_manifest.keys()
+    
+    for rel in removed:
+        os.unlink(os.path.join(dst, rel))
+    
+    # Overlap per-file copies on a thread pool; copy2 keeps mtimes so the next sync matches
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for rel in changed:
+            target = os.path.join(dst, rel)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            futures.append(executor.submit(shutil.copy2, os.path.join(src, rel), target))
+        
+        # Surface the first copy failure, if any
+        for future in futures:
+            future.result()
+    
+    # Drop directories left empty by removed files
+    for root, _, _ in os.walk(dst, topdown=False):
+        if root != str(dst) and not os.listdir(root):
+            os.rmdir(root)
+    
+    return len(changed), len(removed)
+
+async def _run_npm(*args, cwd):
+    """Run an npm command without blocking the event loop and return its exit code"""
+    process = await asyncio.create_subprocess_exec("npm", *args, cwd=cwd)
+    return await process.wait()
+
+async def build_frontend():
     """Build the React frontend for production"""
     print("⚛️  Building React frontend for production...")
     frontend_dir = Path(__file__).parent / "frontend"
@@ -23,22 +78,27 @@ def build_frontend():
     if not (frontend_dir / "node_modules").exists():
         print("📦 Installing frontend dependencies...")
         try:
-            subprocess.run(["npm", "install"], cwd=frontend_dir, check=True)
-        except (subprocess.CalledProcessError, FileNotFoundError) as e:
+            returncode = await _run_npm("install", cwd=frontend_dir)
+        except FileNotFoundError as e:
             print(f"❌ Failed to install dependencies: {e}")
             return False
+        if returncode != 0:
+            print(f"❌ Failed to install dependencies: npm install exited with code {returncode}")
+            return False
     
     # Build the frontend
     try:
-        subprocess.run(["npm", "run", "build"], cwd=frontend_dir, check=True)
-        print("✅ Frontend build completed successfully!")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Frontend build failed: {e}")
-        return False
+        returncode = await _run_npm("run", "build", cwd=frontend_dir)
     except FileNotFoundError:
         print("❌ npm not found. Please install Node.js and npm first.")
         return False
+    
+    if returncode != 0:
+        print(f"❌ Frontend build failed: npm run build exited with code {returncode}")
+        return False
+    
+    print("✅ Frontend build completed successfully!")
+    return True
 
 def setup_static_files():
     """Copy built frontend files to static directory"""
@@ -51,14 +111,10 @@ def setup_static_files():
         print("❌ Frontend build directory not found!")
         return False
     
-    # Remove existing static files
-    if static_dir.exists():
-        shutil.rmtree(static_dir)
-    
-    # Copy build files to static directory
+    # Sync build files into the static directory, copying only what changed
     try:
-        shutil.copytree(frontend_build, static_dir)
-        print("✅ Static files copied successfully!")
+        copied, removed = _sync_tree(frontend_build, static_dir)
+        print(f"✅ Static files synced successfully! ({copied} copied, {removed} removed)")
         return True
     except Exception as e:
         print(f"❌ Failed to copy static files: {e}")
@@ -74,35 +130,62 @@ def create_production_main():
         print("❌ main.py not found!")
         return False
     
-    with open(main_file, 'r') as f:
+    # Explicit UTF-8 and untranslated newlines keep output identical across platforms
+    with open(main_file, 'r', encoding='utf-8', newline='') as f:
         content = f.read()
     
     # Add route to serve React app
     react_route = '''
+from fastapi import Request
+from fastapi.responses import HTMLResponse
+
+# First path segments owned by the API rather than the React app
+_API_ROOTS = frozenset({
+    'api', 'upload', 'uploads', 'status', 'results', 'timeline', 'export',
+    'download', 'session', 'health', 'docs', 'redoc', 'openapi.json'
+})
+
 # Serve React app for all frontend routes
 @app.get("/{full_path:path}", response_class=HTMLResponse)
 async def serve_react_app(request: Request, full_path: str):
     """Serve React app for all frontend routes"""
     # API routes should be handled by existing endpoints
-    if full_path.startswith(('api/', 'upload', 'status/', 'results/', 'timeline/', 'export/', 'download/', 'session/', 'health', 'docs', 'redoc', 'openapi.json')):
+    if full_path.split('/', 1)[0] in _API_ROOTS:
         raise HTTPException(status_code=404, detail="Not found")
     
     # Serve React app
     return FileResponse('static/index.html')
 '''
     
+    # Skip regeneration when main.py and the injected route are unchanged
+    source_hash = hashlib.blake2b((content + react_route).encode('utf-8'), digest_size=16).hexdigest()
+    hash_header = f"# src-hash: {source_hash}\n"
+    prod_main_file = Path(__file__).parent / "main_production.py"
+    if prod_main_file.exists():
+        with open(prod_main_file, 'r', encoding='utf-8', newline='') as f:
+            if f.readline() == hash_header:
+                print("✅ Production configuration up to date!")
+                return True
+    
     # Insert the route before the main block
     if 'if __name__ == "__main__":' in content:
         content = content.replace('if __name__ == "__main__":', react_route + '\nif __name__ == "__main__":')
     
     # Write production main file
-    prod_main_file = Path(__file__).parent / "main_production.py"
-    with open(prod_main_file, 'w') as f:
-        f.write(content)
+    with open(prod_main_file, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(hash_header + content)
     
     print("✅ Production configuration created!")
     return True
 
+async def _build_and_configure():
+    """Run the npm build and create_production_main concurrently"""
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(
+        build_frontend(),
+        loop.run_in_executor(None, create_production_main)
+    )
+
 def main():
     """Main function to build for production"""
     print("🎥 Video Timeline Analyzer - Production Build")
@@ -113,8 +196,10 @@ def main():
         print("❌ main.py not found. Please run this script from the project root directory.")
         sys.exit(1)
     
-    # Build frontend
-    if not build_frontend():
+    # Build frontend while the production main file is generated alongside it
+    frontend_built, production_main_created = asyncio.run(_build_and_configure())
+    
+    if not frontend_built:
         print("❌ Production build failed!")
         sys.exit(1)
     
@@ -123,8 +208,7 @@ def main():
         print("❌ Static file setup failed!")
         sys.exit(1)
     
-    # Create production main file
-    if not create_production_main():
+    if not production_main_created:
         print("❌ Production configuration failed!")
         sys.exit(1)
     
@@ -0,0 +1,57 @@
+"""
+Numeric reductions over segment timing arrays.
+
+Compiled with Numba when it is installed; otherwise the same results come
+from vectorised NumPy reductions.
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+def _reduce_stats_loop(starts, ends, conf, high_confidence):
+    """Single pass over the arrays returning (n, total_dur, max_end, min_dur, max_dur, hi_conf_count)"""
+    n = starts.shape[0]
+    total_dur = 0.0
+    max_end = -np.inf
+    min_dur = np.inf
+    max_dur = -np.inf
+    hi_conf_count = 0
+    
+    for i in range(n):
+        duration = ends[i] - starts[i]
+        total_dur += duration
+        if duration < min_dur:
+            min_dur = duration
+        if duration > max_dur:
+            max_dur = duration
+        if ends[i] > max_end:
+            max_end = ends[i]
+        if conf[i] > high_confidence:
+            hi_conf_count += 1
+    
+    return n, total_dur, max_end, min_dur, max_dur, hi_conf_count
+
+def _reduce_stats_numpy(starts, ends, conf, high_confidence):
+    """NumPy equivalent of the compiled kernel, used when Numba is unavailable"""
+    n = starts.shape[0]
+    if n == 0:
+        return 0, 0.0, -np.inf, np.inf, -np.inf, 0
+    
+    durations = ends - starts
+    return (
+        n,
+        float(durations.sum()),
+        float(ends.max()),
+        float(durations.min()),
+        float(durations.max()),
+        int(np.count_nonzero(conf > high_confidence))
+    )
+
+if numba is not None:
+    reduce_stats = numba.njit(cache=True)(_reduce_stats_loop)
+else:
+    reduce_stats = _reduce_stats_numpy
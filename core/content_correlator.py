@@ -1,13 +1,72 @@
 import re
+import sys
+import json
 import logging
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator
+import numpy as np
+from dataclasses import dataclass, fields
 from .video_analyzer import ScreenSegment
 from .speech_processor import TranscriptSegment
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Slotted dataclasses need Python 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+_SENT_SPLIT = re.compile(r'[.!?]+')
+_TOKEN_RE = re.compile(r'[a-z]+')
+
+# Keywords that indicate visual references
+_VISUAL_REFERENCE_KEYWORDS = frozenset([
+    "see", "look", "here", "this", "that", "click", "button", "screen",
+    "page", "window", "menu", "tab", "panel", "section", "area",
+    "right", "left", "top", "bottom", "above", "below", "next to"
+])
+
+# Common stop words to ignore when extracting topics
+_STOP_WORDS = frozenset({
+    'this', 'that', 'with', 'have', 'will', 'from', 'they', 'been',
+    'were', 'said', 'each', 'which', 'their', 'time', 'about', 'would',
+    'there', 'could', 'other', 'more', 'very', 'what', 'know', 'just',
+    'first', 'into', 'over', 'think', 'also', 'your', 'work', 'life'
+})
+
+# Screen content types in priority order, with the keywords that indicate them
+_SCREEN_CONTENT_TYPES = (
+    ("PowerPoint presentation", ("powerpoint", "slide", "presentation")),
+    ("Code editor", ("code", "editor", "vscode", "programming")),
+    ("Web browser", ("browser", "website", "chrome", "firefox", "url")),
+    ("Document viewer", ("document", "word", "text", "file")),
+    ("Terminal/Command line", ("terminal", "command", "console")),
+    ("Dashboard/Analytics", ("dashboard", "analytics", "chart", "graph")),
+    ("Email application", ("email", "outlook", "message")),
+    ("Media player", ("video", "player", "media"))
+)
+
+def _build_keyword_automaton(keywords):
+    """Build an Aho-Corasick automaton that reports every keyword occurring in a text"""
+    if ahocorasick is None:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+@dataclass(**_DATACLASS_OPTIONS)
 class TimelineSegment:
     """Combined timeline segment with visual and audio content"""
     id: int
@@ -30,17 +89,23 @@ class TimelineSegment:
         start_min, start_sec = divmod(int(self.start_time), 60)
         end_min, end_sec = divmod(int(self.end_time), 60)
         return f"{start_min:02d}:{start_sec:02d} - {end_min:02d}:{end_sec:02d}"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict of fields plus computed properties for JSON serialization"""
+        data = {name: getattr(self, name) for name in _TIMELINE_FIELDS}
+        data['duration'] = self.duration
+        data['formatted_time_range'] = self.formatted_time_range
+        return data
+
+# Field names resolved once; to_dict shares list values by reference instead of deep-copying
+_TIMELINE_FIELDS = tuple(field.name for field in fields(TimelineSegment))
 
 class ContentCorrelator:
     """Correlates visual screen changes with speech transcription"""
     
     def __init__(self):
         # Keywords that indicate visual references
-        self.visual_reference_keywords = [
-            "see", "look", "here", "this", "that", "click", "button", "screen",
-            "page", "window", "menu", "tab", "panel", "section", "area",
-            "right", "left", "top", "bottom", "above", "below", "next to"
-        ]
+        self.visual_reference_keywords = _VISUAL_REFERENCE_KEYWORDS
         
         # Keywords for different content types
         self.content_type_keywords = {
@@ -51,27 +116,57 @@ class ContentCorrelator:
             "application": ["app", "application", "software", "program", "tool"],
             "demo": ["demo", "demonstration", "example", "show", "tutorial"]
         }
+        
+        # Visual references are matched as whole words; multi-word phrases as substrings
+        self._visual_reference_phrases = tuple(
+            keyword for keyword in self.visual_reference_keywords if ' ' in keyword
+        )
+        
+        # Every substring keyword the analyses look for, matched together in one scan
+        self._all_keywords = frozenset(self._visual_reference_phrases).union(
+            *self.content_type_keywords.values(),
+            *(keywords for _, keywords in _SCREEN_CONTENT_TYPES)
+        )
+        # Single-pass keyword matcher (None when pyahocorasick is unavailable)
+        self._keyword_automaton = _build_keyword_automaton(self._all_keywords)
     
     def correlate_content(self, screen_segments: List[ScreenSegment], 
-                         transcript_segments: List[TranscriptSegment]) -> List[TimelineSegment]:
-        """Correlate screen segments with transcript segments"""
+                         transcript_segments: List[TranscriptSegment],
+                         max_workers: Optional[int] = None) -> List[TimelineSegment]:
+        """Correlate screen segments with transcript segments
+        
+        Pass max_workers > 1 to analyze screen segments across worker processes.
+        """
         timeline_segments = []
         
         logger.info(f"Correlating {len(screen_segments)} screen segments with {len(transcript_segments)} transcript segments")
         
-        for screen_segment in screen_segments:
-            # Get transcript for this screen's time range
-            transcript_text = self._get_transcript_for_timerange(
-                transcript_segments, 
-                screen_segment.start_time, 
+        # Index transcripts once and binary-search every screen's window in one call
+        ordered_segments, centers = self._build_transcript_index(transcript_segments)
+        windows = self._locate_transcript_windows(centers, screen_segments)
+        
+        # Get transcript for each screen's time range
+        transcript_texts = [
+            self._get_transcript_for_timerange(
+                ordered_segments,
+                window,
+                screen_segment.start_time,
                 screen_segment.end_time
             )
-            
-            # Analyze content
-            summary = self._generate_summary(transcript_text)
-            key_topics = self._extract_key_topics(transcript_text)
-            screen_description = self._describe_screen_content(transcript_text)
-            confidence_score = self._calculate_confidence_score(transcript_text, screen_segment)
+            for screen_segment, window in zip(screen_segments, windows)
+        ]
+        
+        # Analyze content; each screen segment is independent of the others
+        if max_workers and max_workers > 1 and len(screen_segments) > 1:
+            chunksize = max(1, len(screen_segments) // (max_workers * 4))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                analyses = list(executor.map(self._analyze, transcript_texts, screen_segments,
+                                             chunksize=chunksize))
+        else:
+            analyses = map(self._analyze, transcript_texts, screen_segments)
+        
+        for screen_segment, transcript_text, analysis in zip(screen_segments, transcript_texts, analyses):
+            summary, key_topics, screen_description, confidence_score = analysis
             
             timeline_segment = TimelineSegment(
                 id=screen_segment.id,
@@ -90,50 +185,92 @@ class ContentCorrelator:
         logger.info(f"Created {len(timeline_segments)} timeline segments")
         return timeline_segments
     
-    def _get_transcript_for_timerange(self, transcript_segments: List[TranscriptSegment], 
-                                    start_time: float, end_time: float) -> str:
-        """Get transcript text for a specific time range without overlaps"""
-        relevant_segments = []
+    def _build_transcript_index(self, transcript_segments: List[TranscriptSegment]) -> Tuple[List[Tuple[int, TranscriptSegment]], np.ndarray]:
+        """Order transcript segments by center time for binary-searched range lookups"""
+        count = len(transcript_segments)
+        starts = np.fromiter((seg.start_time for seg in transcript_segments), dtype=np.float64, count=count)
+        ends = np.fromiter((seg.end_time for seg in transcript_segments), dtype=np.float64, count=count)
         
-        for segment in transcript_segments:
-            # Check if segment is primarily within this time range
-            segment_center = (segment.start_time + segment.end_time) / 2
-            if start_time <= segment_center < end_time:
-                relevant_segments.append(segment)
+        # Stable argsort keeps equal centers in input order, like sorted() did
+        centers = (starts + ends) / 2
+        order = np.argsort(centers, kind='stable')
+        ordered_segments = [(i, transcript_segments[i]) for i in order.tolist()]
+        return ordered_segments, centers[order]
+    
+    def _locate_transcript_windows(self, centers: np.ndarray,
+                                   screen_segments: List[ScreenSegment]) -> List[Tuple[int, int, int]]:
+        """Find each screen's (lo, hi, boundary) slice of center-ordered transcripts"""
+        starts = np.fromiter((seg.start_time for seg in screen_segments), dtype=np.float64, count=len(screen_segments))
+        ends = np.fromiter((seg.end_time for seg in screen_segments), dtype=np.float64, count=len(screen_segments))
+        
+        # lo:hi holds centers in [start, end); lo:boundary extends to centers equal to end
+        lo = np.searchsorted(centers, starts, side='left')
+        hi = np.searchsorted(centers, ends, side='left')
+        boundary = np.searchsorted(centers, ends, side='right')
+        return list(zip(lo.tolist(), hi.tolist(), boundary.tolist()))
+    
+    def _get_transcript_for_timerange(self, ordered_segments: List[Tuple[int, TranscriptSegment]],
+                                    window: Tuple[int, int, int], start_time: float, end_time: float) -> str:
+        """Get transcript text for a specific time range without overlaps"""
+        # Segments whose center falls within this time range
+        lo, hi, boundary = window
+        relevant_segments = ordered_segments[lo:hi]
         
-        # If no segments found with center method, fall back to overlap method
+        # If no segments found with center method, fall back to overlap method.
+        # At least 50% overlap implies the center lies in [start_time, end_time],
+        # so only the segments centered exactly on end_time are left to check.
         if not relevant_segments:
-            for segment in transcript_segments:
-                # Check for significant overlap (at least 50% of segment duration)
+            for item in ordered_segments[lo:boundary]:
+                segment = item[1]
                 overlap_start = max(segment.start_time, start_time)
                 overlap_end = min(segment.end_time, end_time)
                 overlap_duration = max(0, overlap_end - overlap_start)
                 segment_duration = segment.end_time - segment.start_time
                 
                 if segment_duration > 0 and overlap_duration / segment_duration >= 0.5:
-                    relevant_segments.append(segment)
-        
-        # Sort by start time and remove duplicates
-        relevant_segments.sort(key=lambda x: x.start_time)
-        seen_texts = set()
-        unique_segments = []
+                    relevant_segments.append(item)
         
-        for segment in relevant_segments:
-            if segment.text not in seen_texts:
-                unique_segments.append(segment)
-                seen_texts.add(segment.text)
+        # Sort by start time (ties keep input order) and remove duplicates
+        relevant_segments.sort(key=lambda item: (item[1].start_time, item[0]))
+        unique_texts = dict.fromkeys(segment.text for _, segment in relevant_segments)
         
         # Combine text
-        transcript_text = " ".join([seg.text for seg in unique_segments])
+        transcript_text = " ".join(unique_texts)
         return transcript_text.strip()
     
+    def _analyze(self, transcript_text: str, screen_segment: ScreenSegment) -> Tuple[str, List[str], str, float]:
+        """Run all transcript analyses, lowercasing and scanning the text only once"""
+        text_lower = transcript_text.lower()
+        scan = self._analyze_fused(text_lower)
+        return (
+            self._generate_summary(transcript_text),
+            self._extract_key_topics(transcript_text, scan),
+            self._describe_screen_content(text_lower, scan),
+            self._calculate_confidence_score(transcript_text, scan, screen_segment)
+        )
+    
+    def _analyze_fused(self, text_lower: str) -> Dict[str, Any]:
+        """Collect matched keywords, word tokens and topic word frequencies for the shared analyses"""
+        if self._keyword_automaton is not None:
+            keywords = {keyword for _, keyword in self._keyword_automaton.iter(text_lower)}
+        else:
+            keywords = {keyword for keyword in self._all_keywords if keyword in text_lower}
+        
+        tokens = _TOKEN_RE.findall(text_lower)
+        
+        # Look for repeated important words (nouns/verbs)
+        word_freq = Counter(word for word in tokens
+                            if len(word) > 4 and word not in _STOP_WORDS)
+        
+        return {'keywords': keywords, 'tokens': frozenset(tokens), 'word_freq': word_freq}
+    
     def _generate_summary(self, transcript_text: str) -> str:
         """Generate a concise summary of the discussion"""
         if not transcript_text:
             return "No discussion - Visual only"
         
         # Simple extractive summary - take first and key sentences
-        sentences = re.split(r'[.!?]+', transcript_text)
+        sentences = _SENT_SPLIT.split(transcript_text)
         sentences = [s.strip() for s in sentences if s.strip()]
         
         if not sentences:
@@ -143,7 +280,8 @@ class ContentCorrelator:
         summary_sentences = [sentences[0]]
         
         for sentence in sentences[1:]:
-            if any(keyword in sentence.lower() for keyword in self.visual_reference_keywords):
+            sentence_lower = sentence.lower()
+            if any(keyword in sentence_lower for keyword in self.visual_reference_keywords):
                 if sentence not in summary_sentences:
                     summary_sentences.append(sentence)
         
@@ -154,72 +292,41 @@ class ContentCorrelator:
         
         return summary
     
-    def _extract_key_topics(self, transcript_text: str) -> List[str]:
+    def _extract_key_topics(self, transcript_text: str, scan: Dict[str, Any]) -> List[str]:
         """Extract key topics from transcript"""
         if not transcript_text:
             return []
         
         topics = []
-        text_lower = transcript_text.lower()
+        found_keywords = scan['keywords']
         
         # Check for content type keywords
         for content_type, keywords in self.content_type_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
+            if not found_keywords.isdisjoint(keywords):
                 topics.append(content_type.title())
         
-        # Extract potential topics using simple NLP
-        # Look for repeated important words (nouns/verbs)
-        words = re.findall(r'\b[a-zA-Z]{4,}\b', transcript_text.lower())
-        word_freq = {}
-        
-        # Common stop words to ignore
-        stop_words = {
-            'this', 'that', 'with', 'have', 'will', 'from', 'they', 'been',
-            'were', 'said', 'each', 'which', 'their', 'time', 'about', 'would',
-            'there', 'could', 'other', 'more', 'very', 'what', 'know', 'just',
-            'first', 'into', 'over', 'think', 'also', 'your', 'work', 'life'
-        }
-        
-        for word in words:
-            if word not in stop_words and len(word) > 4:
-                word_freq[word] = word_freq.get(word, 0) + 1
-        
         # Get most frequent words as topics
-        frequent_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:3]
+        frequent_words = scan['word_freq'].most_common(3)
         for word, freq in frequent_words:
             if freq > 1:  # Only include words mentioned multiple times
                 topics.append(word.title())
         
         return topics[:5]  # Limit to 5 topics
     
-    def _describe_screen_content(self, transcript_text: str) -> str:
+    def _describe_screen_content(self, text_lower: str, scan: Dict[str, Any]) -> str:
         """Describe what type of screen content is being shown"""
-        if not transcript_text:
+        if not text_lower:
             return "Unknown screen content"
         
-        text_lower = transcript_text.lower()
-        
-        # Check for specific application mentions
-        if any(word in text_lower for word in ["powerpoint", "slide", "presentation"]):
-            return "PowerPoint presentation"
-        elif any(word in text_lower for word in ["code", "editor", "vscode", "programming"]):
-            return "Code editor"
-        elif any(word in text_lower for word in ["browser", "website", "chrome", "firefox", "url"]):
-            return "Web browser"
-        elif any(word in text_lower for word in ["document", "word", "text", "file"]):
-            return "Document viewer"
-        elif any(word in text_lower for word in ["terminal", "command", "console"]):
-            return "Terminal/Command line"
-        elif any(word in text_lower for word in ["dashboard", "analytics", "chart", "graph"]):
-            return "Dashboard/Analytics"
-        elif any(word in text_lower for word in ["email", "outlook", "message"]):
-            return "Email application"
-        elif any(word in text_lower for word in ["video", "player", "media"]):
-            return "Media player"
-        else:
-            return "Application screen"
+        # Check for specific application mentions, highest priority first
+        found_keywords = scan['keywords']
+        for description, keywords in _SCREEN_CONTENT_TYPES:
+            if not found_keywords.isdisjoint(keywords):
+                return description
+        return "Application screen"
     
-    def _calculate_confidence_score(self, transcript_text: str, screen_segment: ScreenSegment) -> float:
+    def _calculate_confidence_score(self, transcript_text: str, scan: Dict[str, Any],
+                                    screen_segment: ScreenSegment) -> float:
         """Calculate confidence score for the correlation"""
         if not transcript_text:
             return 0.3  # Low confidence for visual-only segments
@@ -227,8 +334,8 @@ class ContentCorrelator:
         score = 0.5  # Base score
         
         # Boost score for visual references
-        visual_refs = sum(1 for keyword in self.visual_reference_keywords 
-                         if keyword in transcript_text.lower())
+        visual_refs = len(self.visual_reference_keywords.intersection(scan['tokens']))
+        visual_refs += sum(1 for phrase in self._visual_reference_phrases if phrase in scan['keywords'])
         score += min(visual_refs * 0.1, 0.3)
         
         # Boost score for longer discussions
@@ -248,18 +355,48 @@ class ContentCorrelator:
     
     def export_timeline_data(self, timeline_segments: List[TimelineSegment]) -> Dict[str, Any]:
         """Export timeline data for JSON serialization"""
+        # Aggregate metadata in a single pass over the segments
+        total_duration = 0
+        duration_sum = 0.0
+        for segment in timeline_segments:
+            if segment.end_time > total_duration:
+                total_duration = segment.end_time
+            duration_sum += segment.duration
+        
         return {
-            'segments': [asdict(segment) for segment in timeline_segments],
+            'segments': [segment.to_dict() for segment in timeline_segments],
             'metadata': {
                 'total_segments': len(timeline_segments),
-                'total_duration': max(seg.end_time for seg in timeline_segments) if timeline_segments else 0,
-                'avg_segment_duration': sum(seg.duration for seg in timeline_segments) / len(timeline_segments) if timeline_segments else 0
+                'total_duration': total_duration,
+                'avg_segment_duration': duration_sum / len(timeline_segments) if timeline_segments else 0
             }
         }
     
+    def export_timeline_bytes(self, timeline_segments: List[TimelineSegment], indent: bool = False) -> bytes:
+        """Export timeline data as UTF-8 encoded JSON, using orjson when available"""
+        timeline_data = self.export_timeline_data(timeline_segments)
+        
+        if orjson is not None:
+            option = orjson.OPT_SERIALIZE_NUMPY
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(timeline_data, option=option)
+        
+        return json.dumps(timeline_data, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+    
     def filter_segments_by_confidence(self, timeline_segments: List[TimelineSegment], 
                                     min_confidence: float = 0.5) -> List[TimelineSegment]:
         """Filter segments by confidence score"""
         filtered = [seg for seg in timeline_segments if seg.confidence_score >= min_confidence]
         logger.info(f"Filtered {len(timeline_segments)} segments to {len(filtered)} with confidence >= {min_confidence}")
         return filtered
+    
+    def iter_segments_by_confidence(self, timeline_segments: Iterable[TimelineSegment], 
+                                    min_confidence: float = 0.5) -> Iterator[TimelineSegment]:
+        """Lazily yield segments meeting the confidence threshold"""
+        return (seg for seg in timeline_segments if seg.confidence_score >= min_confidence)
+    
+    def count_segments_by_confidence(self, timeline_segments: Iterable[TimelineSegment], 
+                                     min_confidence: float = 0.5) -> int:
+        """Count segments meeting the confidence threshold without building a list"""
+        return sum(1 for seg in timeline_segments if seg.confidence_score >= min_confidence)
@@ -1,11 +1,16 @@
 import os
+import sys
 import logging
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
+from .transcript_index import TranscriptLookupMixin
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Slotted dataclasses need Python 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class TranscriptSegment:
     """Represents a transcribed speech segment"""
     start_time: float
@@ -18,13 +23,13 @@ class TranscriptSegment:
     def duration(self) -> float:
         return self.end_time - self.start_time
 
-class MockSpeechProcessor:
+class MockSpeechProcessor(TranscriptLookupMixin):
     """Mock speech processor for testing when Groq is not available"""
     
     def __init__(self, api_key: Optional[str] = None):
         logger.info("Using mock speech processor for demonstration")
         self.chunk_duration = 30
-        
+    
     def process_video_audio(self, video_path: str) -> List[TranscriptSegment]:
         """Generate mock transcript segments for demonstration"""
         logger.info("Generating mock transcript segments...")
@@ -96,33 +101,17 @@ class MockSpeechProcessor:
         logger.info(f"Generated {len(mock_segments)} mock transcript segments")
         return mock_segments
     
-    def get_transcript_for_timerange(self, transcript_segments: List[TranscriptSegment], 
-                                   start_time: float, end_time: float) -> str:
-        """Get transcript text for a specific time range"""
-        relevant_segments = []
-        
-        for segment in transcript_segments:
-            # Check if segment overlaps with the time range
-            if (segment.start_time < end_time and segment.end_time > start_time):
-                relevant_segments.append(segment)
-        
-        # Sort by start time
-        relevant_segments.sort(key=lambda x: x.start_time)
-        
-        # Combine text
-        transcript_text = " ".join([seg.text for seg in relevant_segments])
-        return transcript_text.strip()
-    
     def analyze_speech_patterns(self, transcript_segments: List[TranscriptSegment]) -> Dict[str, Any]:
         """Analyze speech patterns for insights"""
         if not transcript_segments:
             return {}
         
-        total_duration = max(seg.end_time for seg in transcript_segments)
-        total_speech_time = sum(seg.duration for seg in transcript_segments)
+        # Shares the column arrays built for time-range lookups
+        index = self._index_for(transcript_segments)
+        _, total_speech_time, total_duration, _, _, _ = index.array.reduce()
         
         # Calculate speaking rate (words per minute)
-        total_words = sum(len(seg.text.split()) for seg in transcript_segments)
+        total_words = int(index.word_counts.sum())
         speaking_rate = (total_words / (total_speech_time / 60)) if total_speech_time > 0 else 0
         
         return {
@@ -1,106 +1,202 @@
 import os
+import shutil
+import tempfile
 import logging
-from typing import List, Dict, Any
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from datetime import datetime
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak, Table, TableStyle
-from reportlab.platypus.frames import Frame
-from reportlab.platypus.doctemplate import PageTemplate, BaseDocTemplate
-from PIL import Image as PILImage
 from .content_correlator import TimelineSegment
+from .segment_array import SegmentArray
 
 logger = logging.getLogger(__name__)
 
+# ReportLab and PIL are imported on first export (see _load_pdf_libs) so importing this module stays cheap
+rl_config = colors = A4 = inch = getSampleStyleSheet = ParagraphStyle = None
+SimpleDocTemplate = Paragraph = Spacer = Image = PageBreak = Table = TableStyle = KeepTogether = None
+PILImage = None
+
+# Longest transcript excerpt printed per segment
+_TRANSCRIPT_PREVIEW_CHARS = 1000
+
+# Report palette, parsed once when the styles are first built
+TITLE_COLOR = '#2C3E50'
+SUBTITLE_COLOR = '#34495E'
+SUBTITLE_BORDER = '#BDC3C7'
+SUBTITLE_BG = '#ECF0F1'
+SEGMENT_HEADER_COLOR = '#2980B9'
+SEGMENT_HEADER_BORDER = '#3498DB'
+SEGMENT_HEADER_BG = '#EBF5FB'
+SUMMARY_BG = '#F8F9FA'
+SUMMARY_BORDER = '#DEE2E6'
+TRANSCRIPT_COLOR = '#495057'
+TOPICS_COLOR = '#28A745'
+TABLE_HEADER_BG = '#3498DB'
+TABLE_GRID = '#BDC3C7'
+
+def _load_pdf_libs():
+    """Import ReportLab and PIL into module globals on first use"""
+    global rl_config, colors, A4, inch, getSampleStyleSheet, ParagraphStyle
+    global SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak, Table, TableStyle, KeepTogether, PILImage
+    if PILImage is not None:
+        return
+    
+    from reportlab import rl_config
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak, Table, TableStyle, KeepTogether
+    from PIL import Image as PILImage
+    
+    # Binary streams are valid PDF and skip ASCII-85's 25% size/CPU overhead. Set once for the
+    # process, since builds run concurrently; RL_useA85 in the environment keeps ReportLab's setting
+    if 'RL_useA85' not in os.environ:
+        rl_config.useA85 = 0
+
+@lru_cache(maxsize=1)
+def _summary_table_style():
+    """Summary statistics table style, shared by every export"""
+    _load_pdf_libs()
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(TABLE_HEADER_BG)),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor(SUMMARY_BG)),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor(TABLE_GRID))
+    ])
+
+@lru_cache(maxsize=1)
+def _check_rl_accel() -> bool:
+    """Report whether ReportLab's C accelerator is installed, warning once if not"""
+    try:
+        import _rl_accel  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("install reportlab[accel] or _rl_accel for ~35% faster PDF generation")
+        return False
+
+@lru_cache(maxsize=1024)
+def _image_size(image_path: str, mtime: float) -> Tuple[int, int]:
+    """Read image dimensions from the file header; mtime keeps cached entries fresh"""
+    # PIL parses only the header on open, pixels are never decoded here
+    with PILImage.open(image_path) as pil_img:
+        return pil_img.size
+
+def _make_thumbnail(image_path: str, thumb_dir: str, max_size: Tuple[int, int]) -> str:
+    """Write a downscaled JPEG copy of image_path into thumb_dir and return its path"""
+    fd, thumb_path = tempfile.mkstemp(suffix='.jpg', dir=thumb_dir)
+    os.close(fd)
+    with PILImage.open(image_path) as pil_img:
+        # JPEG sources can be decoded directly at a reduced scale
+        pil_img.draft('RGB', max_size)
+        pil_img.thumbnail(max_size, PILImage.LANCZOS)
+        pil_img.convert('RGB').save(thumb_path, 'JPEG', quality=80, optimize=True, progressive=False)
+    return thumb_path
+
+@lru_cache(maxsize=1)
+def _build_styles():
+    """Build the sample stylesheet plus custom paragraph styles once per process"""
+    _load_pdf_libs()
+    styles = getSampleStyleSheet()
+    
+    # Title style
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Title'],
+        fontSize=24,
+        spaceAfter=30,
+        textColor=colors.HexColor(TITLE_COLOR),
+        alignment=1  # Center alignment
+    ))
+    
+    # Subtitle style
+    styles.add(ParagraphStyle(
+        name='CustomSubtitle',
+        parent=styles['Heading1'],
+        fontSize=16,
+        spaceAfter=20,
+        textColor=colors.HexColor(SUBTITLE_COLOR),
+        borderWidth=1,
+        borderColor=colors.HexColor(SUBTITLE_BORDER),
+        borderPadding=10,
+        backColor=colors.HexColor(SUBTITLE_BG)
+    ))
+    
+    # Segment header style
+    styles.add(ParagraphStyle(
+        name='SegmentHeader',
+        parent=styles['Heading2'],
+        fontSize=14,
+        spaceAfter=10,
+        textColor=colors.HexColor(SEGMENT_HEADER_COLOR),
+        borderWidth=1,
+        borderColor=colors.HexColor(SEGMENT_HEADER_BORDER),
+        borderPadding=5,
+        backColor=colors.HexColor(SEGMENT_HEADER_BG)
+    ))
+    
+    # Summary style
+    styles.add(ParagraphStyle(
+        name='Summary',
+        parent=styles['Normal'],
+        fontSize=11,
+        spaceAfter=10,
+        textColor=colors.HexColor(TITLE_COLOR),
+        leftIndent=20,
+        rightIndent=20,
+        backColor=colors.HexColor(SUMMARY_BG),
+        borderWidth=1,
+        borderColor=colors.HexColor(SUMMARY_BORDER),
+        borderPadding=10
+    ))
+    
+    # Transcript style
+    styles.add(ParagraphStyle(
+        name='Transcript',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=10,
+        textColor=colors.HexColor(TRANSCRIPT_COLOR),
+        leftIndent=15,
+        fontName='Helvetica'
+    ))
+    
+    # Topics style
+    styles.add(ParagraphStyle(
+        name='Topics',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=5,
+        textColor=colors.HexColor(TOPICS_COLOR),
+        leftIndent=20,
+        bulletIndent=10
+    ))
+    
+    return styles
+
 class PDFExporter:
     """Export timeline analysis to professional PDF report"""
     
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
+        self._has_accel = _check_rl_accel()
     
-    def _setup_custom_styles(self):
-        """Setup custom paragraph styles"""
-        # Title style
-        self.styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=self.styles['Title'],
-            fontSize=24,
-            spaceAfter=30,
-            textColor=colors.HexColor('#2C3E50'),
-            alignment=1  # Center alignment
-        ))
-        
-        # Subtitle style
-        self.styles.add(ParagraphStyle(
-            name='CustomSubtitle',
-            parent=self.styles['Heading1'],
-            fontSize=16,
-            spaceAfter=20,
-            textColor=colors.HexColor('#34495E'),
-            borderWidth=1,
-            borderColor=colors.HexColor('#BDC3C7'),
-            borderPadding=10,
-            backColor=colors.HexColor('#ECF0F1')
-        ))
-        
-        # Segment header style
-        self.styles.add(ParagraphStyle(
-            name='SegmentHeader',
-            parent=self.styles['Heading2'],
-            fontSize=14,
-            spaceAfter=10,
-            textColor=colors.HexColor('#2980B9'),
-            borderWidth=1,
-            borderColor=colors.HexColor('#3498DB'),
-            borderPadding=5,
-            backColor=colors.HexColor('#EBF5FB')
-        ))
-        
-        # Summary style
-        self.styles.add(ParagraphStyle(
-            name='Summary',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            spaceAfter=10,
-            textColor=colors.HexColor('#2C3E50'),
-            leftIndent=20,
-            rightIndent=20,
-            backColor=colors.HexColor('#F8F9FA'),
-            borderWidth=1,
-            borderColor=colors.HexColor('#DEE2E6'),
-            borderPadding=10
-        ))
-        
-        # Transcript style
-        self.styles.add(ParagraphStyle(
-            name='Transcript',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            spaceAfter=10,
-            textColor=colors.HexColor('#495057'),
-            leftIndent=15,
-            fontName='Helvetica'
-        ))
-        
-        # Topics style
-        self.styles.add(ParagraphStyle(
-            name='Topics',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            spaceAfter=5,
-            textColor=colors.HexColor('#28A745'),
-            leftIndent=20,
-            bulletIndent=10
-        ))
+    @property
+    def styles(self):
+        """Shared, prebuilt stylesheet; treat as read-only"""
+        return _build_styles()
     
     def export_timeline_pdf(self, timeline_segments: List[TimelineSegment], 
                           output_path: str, video_filename: str = "Video") -> str:
         """Export timeline to PDF report"""
         try:
             logger.info(f"Exporting timeline to PDF: {output_path}")
+            _load_pdf_libs()
             
             # Create PDF document
             doc = SimpleDocTemplate(
@@ -112,20 +208,26 @@ class PDFExporter:
                 bottomMargin=18
             )
             
-            # Build story (content)
-            story = []
-            
-            # Add title page
-            story.extend(self._create_title_page(video_filename, timeline_segments))
-            
-            # Add summary page
-            story.extend(self._create_summary_page(timeline_segments))
-            
-            # Add detailed timeline
-            story.extend(self._create_detailed_timeline(timeline_segments))
+            # Statistics are computed once and shared by the title and summary pages
+            segment_array = SegmentArray.from_list(
+                timeline_segments, 'confidence_score', ('screen_description', 'key_topics')
+            )
+            stats_data = self._calculate_statistics(timeline_segments, segment_array)
             
-            # Build PDF
-            doc.build(story)
+            # Screenshot thumbnails live until the document has been built
+            thumb_dir = tempfile.mkdtemp(prefix='pdf_thumbs_')
+            try:
+                # Build story (content): title page, summary page, then the detailed timeline
+                story = chain(
+                    self._create_title_page(video_filename, timeline_segments, stats_data),
+                    self._create_summary_page(timeline_segments, stats_data),
+                    self._iter_detailed_timeline(timeline_segments, thumb_dir)
+                )
+                
+                # Build PDF
+                doc.build(list(story))
+            finally:
+                shutil.rmtree(thumb_dir, ignore_errors=True)
             
             logger.info(f"PDF exported successfully to {output_path}")
             return output_path
@@ -134,8 +236,12 @@ class PDFExporter:
             logger.error(f"Error exporting PDF: {e}")
             raise
     
-    def _create_title_page(self, video_filename: str, timeline_segments: List[TimelineSegment]) -> List:
+    def _create_title_page(self, video_filename: str, timeline_segments: List[TimelineSegment],
+                           stats_data: Optional[Dict[str, Any]] = None) -> List:
         """Create title page content"""
+        if stats_data is None:
+            stats_data = self._calculate_statistics(timeline_segments)
+        
         content = []
         
         # Main title
@@ -144,29 +250,32 @@ class PDFExporter:
         content.append(Spacer(1, 20))
         
         # Video information
-        video_info = f"<b>Video:</b> {video_filename}<br/>"
-        video_info += f"<b>Analysis Date:</b> {datetime.now().strftime('%B %d, %Y at %I:%M %p')}<br/>"
-        video_info += f"<b>Total Segments:</b> {len(timeline_segments)}<br/>"
+        info_lines = [
+            f"<b>Video:</b> {video_filename}<br/>",
+            f"<b>Analysis Date:</b> {datetime.now().strftime('%B %d, %Y at %I:%M %p')}<br/>",
+            f"<b>Total Segments:</b> {len(timeline_segments)}<br/>"
+        ]
         
         if timeline_segments:
-            total_duration = max(seg.end_time for seg in timeline_segments)
+            total_duration = stats_data['total_duration']
             duration_min = int(total_duration // 60)
             duration_sec = int(total_duration % 60)
-            video_info += f"<b>Total Duration:</b> {duration_min}:{duration_sec:02d}<br/>"
+            info_lines.append(f"<b>Total Duration:</b> {duration_min}:{duration_sec:02d}<br/>")
         
-        info_para = Paragraph(video_info, self.styles['Normal'])
+        info_para = Paragraph("".join(info_lines), self.styles['Normal'])
         content.append(info_para)
         content.append(Spacer(1, 30))
         
         # Executive summary
-        exec_summary = self._generate_executive_summary(timeline_segments)
+        exec_summary = self._generate_executive_summary(timeline_segments, stats_data)
         content.append(Paragraph("<b>Executive Summary</b>", self.styles['CustomSubtitle']))
         content.append(Paragraph(exec_summary, self.styles['Summary']))
         
         content.append(PageBreak())
         return content
     
-    def _create_summary_page(self, timeline_segments: List[TimelineSegment]) -> List:
+    def _create_summary_page(self, timeline_segments: List[TimelineSegment],
+                             stats_data: Optional[Dict[str, Any]] = None) -> List:
         """Create summary statistics page"""
         content = []
         
@@ -174,7 +283,8 @@ class PDFExporter:
         content.append(Spacer(1, 20))
         
         # Statistics table
-        stats_data = self._calculate_statistics(timeline_segments)
+        if stats_data is None:
+            stats_data = self._calculate_statistics(timeline_segments)
         
         table_data = [
             ['Metric', 'Value'],
@@ -188,16 +298,7 @@ class PDFExporter:
         ]
         
         table = Table(table_data, colWidths=[3*inch, 2*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498DB')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F8F9FA')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#BDC3C7'))
-        ]))
+        table.setStyle(_summary_table_style())
         
         content.append(table)
         content.append(Spacer(1, 30))
@@ -205,24 +306,25 @@ class PDFExporter:
         # Top topics
         if stats_data['top_topics']:
             content.append(Paragraph("Most Discussed Topics", self.styles['CustomSubtitle']))
-            for i, topic in enumerate(stats_data['top_topics'][:10], 1):
+            for i, topic in enumerate(stats_data['top_topics'], 1):
                 topic_text = f"{i}. {topic}"
                 content.append(Paragraph(topic_text, self.styles['Topics']))
         
         content.append(PageBreak())
         return content
     
-    def _create_detailed_timeline(self, timeline_segments: List[TimelineSegment]) -> List:
-        """Create detailed timeline content"""
-        content = []
+    def _iter_detailed_timeline(self, timeline_segments: List[TimelineSegment],
+                                thumb_dir: Optional[str] = None) -> Iterator:
+        """Yield detailed timeline content, one flowable group per segment"""
+        thumbnails = self._prepare_thumbnails(timeline_segments, thumb_dir) if thumb_dir else {}
         
-        content.append(Paragraph("Detailed Timeline", self.styles['CustomTitle']))
-        content.append(Spacer(1, 20))
+        yield Paragraph("Detailed Timeline", self.styles['CustomTitle'])
+        yield Spacer(1, 20)
         
-        for i, segment in enumerate(timeline_segments):
+        for segment in timeline_segments:
             # Segment header
             header_text = f"Screen {segment.id} - {segment.formatted_time_range} ({segment.duration:.1f}s)"
-            content.append(Paragraph(header_text, self.styles['SegmentHeader']))
+            content = [Paragraph(header_text, self.styles['SegmentHeader'])]
             
             # Screen type
             type_text = f"<b>Type:</b> {segment.screen_description}"
@@ -233,7 +335,8 @@ class PDFExporter:
             if segment.screenshot_path and os.path.exists(segment.screenshot_path):
                 try:
                     # Resize image to fit page
-                    img = self._resize_image_for_pdf(segment.screenshot_path)
+                    img = self._resize_image_for_pdf(segment.screenshot_path, thumb_dir=thumb_dir,
+                                                     thumbnails=thumbnails)
                     content.append(img)
                     content.append(Spacer(1, 10))
                 except Exception as e:
@@ -246,124 +349,132 @@ class PDFExporter:
             
             # Key topics
             if segment.key_topics:
-                topics_text = "<b>Key Topics:</b><br/>"
-                for topic in segment.key_topics:
-                    topics_text += f"• {topic}<br/>"
+                topics_text = "<b>Key Topics:</b><br/>" + "".join(f"• {topic}<br/>" for topic in segment.key_topics)
                 content.append(Paragraph(topics_text, self.styles['Topics']))
             
-            # Full transcript
+            # Full transcript, truncated before it reaches the Paragraph
             if segment.transcript:
                 content.append(Paragraph("<b>Full Transcript:</b>", self.styles['Normal']))
-                # Truncate very long transcripts
                 transcript_text = segment.transcript
-                if len(transcript_text) > 1000:
-                    transcript_text = transcript_text[:1000] + "... [truncated]"
+                if len(transcript_text) > _TRANSCRIPT_PREVIEW_CHARS:
+                    transcript_text = transcript_text[:_TRANSCRIPT_PREVIEW_CHARS] + "... [truncated]"
                 content.append(Paragraph(transcript_text, self.styles['Transcript']))
             
-            # Add spacing between segments
-            content.append(Spacer(1, 20))
+            # Keep each segment on one page where it fits instead of forcing a break every 3 segments
+            yield KeepTogether(content)
             
-            # Page break every 3 segments to avoid overcrowding
-            if (i + 1) % 3 == 0 and i < len(timeline_segments) - 1:
-                content.append(PageBreak())
+            # Add spacing between segments
+            yield Spacer(1, 20)
+    
+    def _prepare_thumbnails(self, timeline_segments: List[TimelineSegment], thumb_dir: str,
+                            max_width: int = 400, max_height: int = 300) -> Dict[str, str]:
+        """Thumbnail every oversized screenshot concurrently, keyed by source path"""
+        max_size = (max_width * 2, max_height * 2)
+        
+        def thumbnail_if_oversized(image_path):
+            try:
+                width, height = _image_size(image_path, os.path.getmtime(image_path))
+                if width > max_size[0] or height > max_size[1]:
+                    return _make_thumbnail(image_path, thumb_dir, max_size)
+            except Exception as e:
+                logger.warning(f"Could not thumbnail screenshot {image_path}: {e}")
+            return None
+        
+        # Unique, existing screenshots in timeline order
+        paths = list(dict.fromkeys(
+            seg.screenshot_path for seg in timeline_segments
+            if seg.screenshot_path and os.path.exists(seg.screenshot_path)
+        ))
+        if not paths:
+            return {}
         
-        return content
+        # PIL releases the GIL while decoding and resizing, so threads scale here
+        with ThreadPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1)) as executor:
+            thumbs = executor.map(thumbnail_if_oversized, paths)
+            return {path: thumb for path, thumb in zip(paths, thumbs) if thumb}
     
-    def _resize_image_for_pdf(self, image_path: str, max_width: int = 400, max_height: int = 300):
-        """Resize image to fit in PDF"""
+    def _resize_image_for_pdf(self, image_path: str, max_width: int = 400, max_height: int = 300,
+                              thumb_dir: Optional[str] = None, thumbnails: Optional[Dict[str, str]] = None):
+        """Resize image to fit in PDF, embedding a downscaled copy when thumb_dir is given"""
+        _load_pdf_libs()
         try:
-            # Open and resize image
-            with PILImage.open(image_path) as pil_img:
-                # Calculate new size maintaining aspect ratio
-                width, height = pil_img.size
-                aspect_ratio = width / height
-                
-                if width > max_width:
-                    width = max_width
-                    height = int(width / aspect_ratio)
-                
-                if height > max_height:
-                    height = max_height
-                    width = int(height * aspect_ratio)
-                
-                # Create ReportLab Image
-                img = Image(image_path, width=width, height=height)
-                return img
+            # Calculate new size maintaining aspect ratio
+            source_width, source_height = _image_size(image_path, os.path.getmtime(image_path))
+            width, height = source_width, source_height
+            aspect_ratio = width / height
+            
+            if width > max_width:
+                width = max_width
+                height = int(width / aspect_ratio)
+            
+            if height > max_height:
+                height = max_height
+                width = int(height * aspect_ratio)
+            
+            # Embed a 2x-resolution thumbnail instead of an oversized screenshot
+            max_size = (max_width * 2, max_height * 2)
+            source_path = image_path
+            if thumb_dir is not None and (source_width > max_size[0] or source_height > max_size[1]):
+                if thumbnails is None:
+                    thumbnails = {}
+                if image_path not in thumbnails:
+                    thumbnails[image_path] = _make_thumbnail(image_path, thumb_dir, max_size)
+                source_path = thumbnails[image_path]
+            
+            # Create ReportLab Image
+            img = Image(source_path, width=width, height=height)
+            return img
                 
         except Exception as e:
             logger.error(f"Error resizing image {image_path}: {e}")
             return Paragraph(f"[Screenshot not available: {os.path.basename(image_path)}]", self.styles['Normal'])
     
-    def _generate_executive_summary(self, timeline_segments: List[TimelineSegment]) -> str:
+    def _generate_executive_summary(self, timeline_segments: List[TimelineSegment],
+                                    stats_data: Optional[Dict[str, Any]] = None) -> str:
         """Generate executive summary"""
         if not timeline_segments:
             return "No timeline segments were detected in this video."
         
-        total_duration = max(seg.end_time for seg in timeline_segments)
-        avg_duration = sum(seg.duration for seg in timeline_segments) / len(timeline_segments)
-        
-        # Count content types
-        content_types = {}
-        all_topics = []
-        
-        for segment in timeline_segments:
-            content_type = segment.screen_description
-            content_types[content_type] = content_types.get(content_type, 0) + 1
-            all_topics.extend(segment.key_topics)
-        
-        most_common_type = max(content_types.items(), key=lambda x: x[1])[0] if content_types else "Unknown"
+        if stats_data is None:
+            stats_data = self._calculate_statistics(timeline_segments)
+        total_duration = stats_data['total_duration']
         
         summary = f"This video analysis identified {len(timeline_segments)} distinct screen segments over "
         summary += f"{int(total_duration//60)}:{int(total_duration%60):02d} minutes. "
-        summary += f"The average segment duration was {avg_duration:.1f} seconds. "
-        summary += f"The most common screen type was '{most_common_type}'. "
+        summary += f"The average segment duration was {stats_data['avg_duration']:.1f} seconds. "
+        summary += f"The most common screen type was '{stats_data['common_content_type']}'. "
         
-        if all_topics:
-            unique_topics = list(set(all_topics))
-            summary += f"A total of {len(unique_topics)} unique topics were discussed throughout the video."
+        if stats_data['unique_topics_count']:
+            summary += f"A total of {stats_data['unique_topics_count']} unique topics were discussed throughout the video."
         
         return summary
     
-    def _calculate_statistics(self, timeline_segments: List[TimelineSegment]) -> Dict[str, Any]:
+    def _calculate_statistics(self, timeline_segments: List[TimelineSegment],
+                              segment_array: Optional[SegmentArray] = None) -> Dict[str, Any]:
         """Calculate statistics for summary page"""
         if not timeline_segments:
             return {}
         
-        durations = [seg.duration for seg in timeline_segments]
-        content_types = {}
-        all_topics = []
-        high_confidence_count = 0
-        
-        for segment in timeline_segments:
-            # Content types
-            content_type = segment.screen_description
-            content_types[content_type] = content_types.get(content_type, 0) + 1
-            
-            # Topics
-            all_topics.extend(segment.key_topics)
-            
-            # High confidence segments
-            if segment.confidence_score > 0.7:
-                high_confidence_count += 1
-        
-        # Most common content type
-        most_common_type = max(content_types.items(), key=lambda x: x[1])[0] if content_types else "Unknown"
+        if segment_array is None:
+            segment_array = SegmentArray.from_list(
+                timeline_segments, 'confidence_score', ('screen_description', 'key_topics')
+            )
         
-        # Top topics by frequency
-        topic_freq = {}
-        for topic in all_topics:
-            topic_freq[topic] = topic_freq.get(topic, 0) + 1
+        # Timing reductions run in one compiled (or vectorised) kernel
+        _, duration_sum, total_duration, min_duration, max_duration, high_confidence_count = segment_array.reduce(0.7)
         
-        top_topics = sorted(topic_freq.items(), key=lambda x: x[1], reverse=True)
-        top_topics = [topic for topic, freq in top_topics]
+        # Content types and topics
+        content_types = Counter(segment_array.columns['screen_description'])
+        topic_freq = Counter(chain.from_iterable(segment_array.columns['key_topics']))
         
         return {
             'total_segments': len(timeline_segments),
-            'avg_duration': sum(durations) / len(durations),
-            'max_duration': max(durations),
-            'min_duration': min(durations),
+            'total_duration': total_duration,
+            'avg_duration': duration_sum / len(timeline_segments),
+            'max_duration': max_duration,
+            'min_duration': min_duration,
             'high_confidence_count': high_confidence_count,
-            'common_content_type': most_common_type,
-            'unique_topics_count': len(set(all_topics)),
-            'top_topics': top_topics
+            'common_content_type': content_types.most_common(1)[0][0],
+            'unique_topics_count': len(topic_freq),
+            'top_topics': [topic for topic, _ in topic_freq.most_common(10)]
         }
@@ -0,0 +1,38 @@
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from ._stats_numba import reduce_stats
+
+logger = logging.getLogger(__name__)
+
+class SegmentArray:
+    """Structure-of-arrays view of a segment list: NumPy timing columns plus plain lists for other fields"""
+    
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, confidences: np.ndarray,
+                 columns: Optional[Dict[str, List]] = None):
+        self.starts = starts
+        self.ends = ends
+        self.confidences = confidences
+        self.columns = columns or {}
+    
+    @classmethod
+    def from_list(cls, segments: Sequence, confidence_attr: str = 'confidence',
+                  fields: Tuple[str, ...] = ()) -> 'SegmentArray':
+        """Materialize the timing columns and any extra per-segment fields once"""
+        count = len(segments)
+        starts = np.fromiter((seg.start_time for seg in segments), dtype=np.float64, count=count)
+        ends = np.fromiter((seg.end_time for seg in segments), dtype=np.float64, count=count)
+        confidences = np.fromiter((getattr(seg, confidence_attr) for seg in segments), dtype=np.float64, count=count)
+        columns = {name: [getattr(seg, name) for seg in segments] for name in fields}
+        return cls(starts, ends, confidences, columns)
+    
+    def __len__(self) -> int:
+        return len(self.starts)
+    
+    @property
+    def durations(self) -> np.ndarray:
+        return self.ends - self.starts
+    
+    def reduce(self, high_confidence: float = 0.7) -> Tuple:
+        """(n, total_dur, max_end, min_dur, max_dur, hi_conf_count) in a single kernel call"""
+        return reduce_stats(self.starts, self.ends, self.confidences, high_confidence)
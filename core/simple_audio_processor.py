@@ -1,14 +1,26 @@
 import os
+import sys
+import shutil
 import subprocess
 import tempfile
+import threading
+import time
+import wave
+import json
 import logging
 from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from .transcript_index import TranscriptLookupMixin
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Slotted dataclasses need Python 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class TranscriptSegment:
     """Represents a transcribed speech segment"""
     start_time: float
@@ -21,21 +33,89 @@ class TranscriptSegment:
     def duration(self) -> float:
         return self.end_time - self.start_time
 
-class SimpleAudioProcessor:
+@lru_cache(maxsize=None)
+def _executable(name: str) -> str:
+    """Resolve an executable's absolute path once, falling back to the bare name"""
+    return shutil.which(name) or name
+
+@lru_cache(maxsize=1)
+def _ffmpeg_available() -> bool:
+    """Run `ffmpeg -version` once per process; availability cannot change mid-run"""
+    try:
+        subprocess.run([_executable('ffmpeg'), '-version'], capture_output=True, check=True)
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        logger.error("FFmpeg not found. Please install FFmpeg to enable audio processing.")
+        return False
+
+class SimpleAudioProcessor(TranscriptLookupMixin):
     """Simple audio processor using FFmpeg for audio extraction"""
     
     def __init__(self):
         self.chunk_duration = 30
+        # Concurrent recognition requests; kept low to stay under Google's rate limits
+        self.max_recognition_workers = 8
+        self._recognizer = None
+        # Offline Vosk recognition, used in preference to Google when a model is installed
+        self.vosk_model_path = os.getenv('VOSK_MODEL_PATH', 'model-en')
+        self.vosk_available = self.check_vosk()
+        self._vosk_model = None
         logger.info("Initialized Simple Audio Processor (FFmpeg-based)")
         
-    def check_ffmpeg(self) -> bool:
-        """Check if FFmpeg is available"""
+    def check_vosk(self) -> bool:
+        """Check if Vosk and its model directory are available"""
         try:
-            subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            logger.error("FFmpeg not found. Please install FFmpeg to enable audio processing.")
+            import vosk
+        except ImportError:
+            logger.info("Vosk not installed. Install with: pip install vosk")
             return False
+        
+        if not os.path.isdir(self.vosk_model_path):
+            logger.info(f"Vosk model not found at {self.vosk_model_path}; set VOSK_MODEL_PATH to enable offline recognition")
+            return False
+        return True
+    
+    def transcribe_with_vosk(self, audio_path: str) -> List[TranscriptSegment]:
+        """Transcribe the extracted PCM WAV locally with Vosk in a single streaming pass"""
+        import vosk
+        
+        # Load the model once per processor; it is large and read-only
+        if self._vosk_model is None:
+            logger.info(f"Loading Vosk model from {self.vosk_model_path}...")
+            self._vosk_model = vosk.Model(self.vosk_model_path)
+        
+        segments = []
+        
+        def add_utterance(result_json: str):
+            words = json.loads(result_json).get('result', [])
+            if not words:
+                return
+            segments.append(TranscriptSegment(
+                start_time=float(words[0]['start']),
+                end_time=float(words[-1]['end']),
+                text=" ".join(word['word'] for word in words),
+                confidence=sum(word.get('conf', 0.0) for word in words) / len(words)
+            ))
+        
+        with wave.open(audio_path, 'rb') as wav:
+            recognizer = vosk.KaldiRecognizer(self._vosk_model, wav.getframerate())
+            recognizer.SetWords(True)
+            
+            # Each completed utterance becomes one timestamped segment
+            while True:
+                data = wav.readframes(4000)
+                if not data:
+                    break
+                if recognizer.AcceptWaveform(data):
+                    add_utterance(recognizer.Result())
+            add_utterance(recognizer.FinalResult())
+        
+        logger.info(f"Vosk transcribed {len(segments)} utterances")
+        return segments
+    
+    def check_ffmpeg(self) -> bool:
+        """Check if FFmpeg is available"""
+        return _ffmpeg_available()
     
     def extract_audio_with_ffmpeg(self, video_path: str, output_path: str) -> bool:
         """Extract audio using FFmpeg"""
@@ -47,7 +127,7 @@ class SimpleAudioProcessor:
             
             # Use FFmpeg to extract audio
             cmd = [
-                'ffmpeg',
+                _executable('ffmpeg'),
                 '-i', video_path,
                 '-vn',  # No video
                 '-acodec', 'pcm_s16le',  # PCM 16-bit
@@ -77,7 +157,7 @@ class SimpleAudioProcessor:
                 return 0.0
                 
             cmd = [
-                'ffprobe',
+                _executable('ffprobe'),
                 '-v', 'quiet',
                 '-show_entries', 'format=duration',
                 '-of', 'default=noprint_wrappers=1:nokey=1',
@@ -98,6 +178,17 @@ class SimpleAudioProcessor:
             logger.error(f"Error getting audio duration: {e}")
             return 0.0
     
+    def get_wav_duration(self, audio_path: str) -> float:
+        """Get duration of a PCM WAV file from its header"""
+        try:
+            with wave.open(audio_path, 'rb') as wav:
+                duration = wav.getnframes() / wav.getframerate()
+            logger.info(f"Audio duration: {duration:.2f} seconds")
+            return duration
+        except (wave.Error, EOFError, OSError) as e:
+            logger.warning(f"Could not read WAV duration: {e}")
+            return 0.0
+    
     def try_basic_speech_recognition(self, audio_path: str, duration: float) -> List[TranscriptSegment]:
         """Try basic speech recognition using available libraries"""
         segments = []
@@ -107,53 +198,53 @@ class SimpleAudioProcessor:
             import speech_recognition as sr
             
             logger.info("Attempting speech recognition with SpeechRecognition library")
-            recognizer = sr.Recognizer()
+            # Reuse one recognizer across calls
+            if self._recognizer is None:
+                self._recognizer = sr.Recognizer()
+            recognizer = self._recognizer
             
             # Process audio in chunks for better results
             chunk_duration = 30.0  # 30-second chunks
             
+            # Read the extracted 16-bit PCM WAV once (~2 MB/min) and slice 30s windows from memory
+            with wave.open(audio_path, 'rb') as wav:
+                sample_rate = wav.getframerate()
+                frame_width = wav.getsampwidth() * wav.getnchannels()
+                sample_width = wav.getsampwidth()
+                pcm = memoryview(wav.readframes(wav.getnframes()))
+            
+            chunks = []
             for start_time in range(0, int(duration), int(chunk_duration)):
                 end_time = min(start_time + chunk_duration, duration)
                 
                 try:
-                    # Extract chunk
-                    chunk_path = self.extract_audio_chunk(audio_path, start_time, end_time)
-                    
-                    if chunk_path:
-                        # Recognize speech in chunk
-                        with sr.AudioFile(chunk_path) as source:
-                            audio_data = recognizer.record(source)
-                        
-                        try:
-                            # Try Google Speech Recognition (free, requires internet)
-                            text = recognizer.recognize_google(audio_data)
-                            
-                            if text.strip():
-                                segment = TranscriptSegment(
-                                    start_time=float(start_time),
-                                    end_time=float(end_time),
-                                    text=text.strip(),
-                                    confidence=0.8
-                                )
-                                segments.append(segment)
-                                logger.info(f"Transcribed chunk {start_time}-{end_time}s: {text[:50]}...")
-                        
-                        except sr.UnknownValueError:
-                            logger.debug(f"No speech detected in chunk {start_time}-{end_time}s")
-                        except sr.RequestError as e:
-                            logger.warning(f"Speech recognition service error: {e}")
-                            break
-                        
-                        # Clean up chunk file
-                        try:
-                            os.unlink(chunk_path)
-                        except:
-                            pass
+                    # Slice chunk
+                    start_byte = int(start_time * sample_rate) * frame_width
+                    end_byte = int(end_time * sample_rate) * frame_width
+                    chunks.append((start_time, end_time, sr.AudioData(bytes(pcm[start_byte:end_byte]), sample_rate, sample_width)))
                 
                 except Exception as e:
                     logger.warning(f"Error processing chunk {start_time}-{end_time}s: {e}")
                     continue
             
+            # Recognition is network-bound, so overlap the requests; results keep chunk order
+            stop_event = threading.Event()
+            with ThreadPoolExecutor(max_workers=self.max_recognition_workers) as executor:
+                futures = [
+                    executor.submit(self._recognize_chunk, sr, recognizer, audio_data, start_time, end_time, stop_event)
+                    for start_time, end_time, audio_data in chunks
+                ]
+                
+                for (start_time, end_time, _), future in zip(chunks, futures):
+                    try:
+                        segment = future.result()
+                    except Exception as e:
+                        logger.warning(f"Error processing chunk {start_time}-{end_time}s: {e}")
+                        continue
+                    
+                    if segment:
+                        segments.append(segment)
+            
             return segments
             
         except ImportError:
@@ -163,6 +254,40 @@ class SimpleAudioProcessor:
         
         return []
     
+    def _recognize_chunk(self, sr, recognizer, audio_data, start_time: float, end_time: float,
+                         stop_event: threading.Event, retries: int = 3) -> Optional[TranscriptSegment]:
+        """Recognize one chunk, retrying service errors with backoff before giving up on the rest"""
+        for attempt in range(retries):
+            if stop_event.is_set():
+                return None
+            
+            try:
+                # Try Google Speech Recognition (free, requires internet)
+                text = recognizer.recognize_google(audio_data)
+            except sr.UnknownValueError:
+                logger.debug(f"No speech detected in chunk {start_time}-{end_time}s")
+                return None
+            except sr.RequestError as e:
+                if attempt == retries - 1:
+                    logger.warning(f"Speech recognition service error: {e}")
+                    stop_event.set()
+                    return None
+                time.sleep(2 ** attempt)
+                continue
+            
+            if not text.strip():
+                return None
+            
+            logger.info(f"Transcribed chunk {start_time}-{end_time}s: {text[:50]}...")
+            return TranscriptSegment(
+                start_time=float(start_time),
+                end_time=float(end_time),
+                text=text.strip(),
+                confidence=0.8
+            )
+        
+        return None
+    
     def extract_audio_chunk(self, audio_path: str, start_time: float, end_time: float) -> Optional[str]:
         """Extract a chunk of audio for processing"""
         try:
@@ -170,7 +295,7 @@ class SimpleAudioProcessor:
                 chunk_path = temp_chunk.name
             
             cmd = [
-                'ffmpeg',
+                _executable('ffmpeg'),
                 '-i', audio_path,
                 '-ss', str(start_time),
                 '-t', str(end_time - start_time),
@@ -198,35 +323,43 @@ class SimpleAudioProcessor:
         try:
             logger.info("Processing video audio with Simple Audio Processor")
             
-            # Get video duration
-            duration = self.get_audio_duration(video_path)
-            
-            if duration <= 0:
-                logger.warning("Could not determine video duration")
-                return []
-            
             # Extract audio to temporary file
             with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
                 audio_path = temp_audio.name
             
-            if not self.extract_audio_with_ffmpeg(video_path, audio_path):
-                logger.warning("Audio extraction failed")
-                return []
-            
-            # Try to use basic speech recognition if available
-            segments = self.try_basic_speech_recognition(audio_path, duration)
+            try:
+                if not self.extract_audio_with_ffmpeg(video_path, audio_path):
+                    logger.warning("Audio extraction failed")
+                    return []
+                
+                # Read the duration from the extracted WAV header instead of running ffprobe
+                duration = self.get_wav_duration(audio_path)
+                
+                if duration <= 0:
+                    logger.warning("Could not determine video duration")
+                    return []
+                
+                # Prefer local Vosk recognition, falling back to basic speech recognition
+                segments = []
+                if self.vosk_available:
+                    try:
+                        segments = self.transcribe_with_vosk(audio_path)
+                    except Exception as e:
+                        logger.warning(f"Vosk recognition failed, falling back: {e}")
+                if not segments:
+                    segments = self.try_basic_speech_recognition(audio_path, duration)
+            finally:
+                # Clean up temporary audio file
+                try:
+                    os.unlink(audio_path)
+                except OSError:
+                    pass
             
             # If no speech recognition available, return empty segments
             if not segments:
                 logger.info("No speech recognition available - returning empty transcript segments")
                 return []
             
-            # Clean up temporary audio file
-            try:
-                os.unlink(audio_path)
-            except:
-                pass
-            
             logger.info(f"Created {len(segments)} audio segments")
             return segments
             
@@ -234,30 +367,14 @@ class SimpleAudioProcessor:
             logger.error(f"Error processing video audio: {e}")
             return []
     
-    def get_transcript_for_timerange(self, transcript_segments: List[TranscriptSegment], 
-                                   start_time: float, end_time: float) -> str:
-        """Get transcript text for a specific time range"""
-        relevant_segments = []
-        
-        for segment in transcript_segments:
-            # Check if segment overlaps with the time range
-            if (segment.start_time < end_time and segment.end_time > start_time):
-                relevant_segments.append(segment)
-        
-        # Sort by start time
-        relevant_segments.sort(key=lambda x: x.start_time)
-        
-        # Combine text
-        transcript_text = " ".join([seg.text for seg in relevant_segments])
-        return transcript_text.strip()
-    
     def analyze_speech_patterns(self, transcript_segments: List[TranscriptSegment]) -> Dict[str, Any]:
         """Analyze speech patterns for insights"""
         if not transcript_segments:
             return {}
         
-        total_duration = max(seg.end_time for seg in transcript_segments) if transcript_segments else 0
-        total_speech_time = sum(seg.duration for seg in transcript_segments)
+        # Shares the column arrays built for time-range lookups
+        segments = self._index_for(transcript_segments).array
+        _, total_speech_time, total_duration, _, _, _ = segments.reduce()
         
         return {
             'total_duration': total_duration,
@@ -1,18 +1,62 @@
+import io
 import os
+import sys
+import json
+import hashlib
+import itertools
+import subprocess
 import tempfile
+import threading
+import time
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
+import numpy as np
 from groq import Groq
-from moviepy.editor import VideoFileClip
-import librosa
 import soundfile as sf
 from dotenv import load_dotenv
+from .transcript_index import TranscriptLookupMixin
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Slotted dataclasses need Python 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# FFmpeg resamples to 16kHz mono, the format Whisper works on
+_SAMPLE_RATE = 16000
+
+_TRANSCRIPTION_MODEL = "whisper-large-v3"
+_TRANSCRIPTION_LANGUAGE = "en"
+
+# Cached transcripts are keyed on the audio plus everything that changes the result
+_CACHE_KEY_PREFIX = f"{_TRANSCRIPTION_MODEL}|{_TRANSCRIPTION_LANGUAGE}|".encode()
+_DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'video-timeline', 'transcripts')
+
+# Audio up to this size goes to Groq as a single upload (the API limit is 25MB)
+_SINGLE_REQUEST_SAMPLES = 24 * 1024 * 1024 // 2
+
+# Bytes of the video file hashed, with its size and mtime, for the whole-video cache key
+_VIDEO_KEY_BYTES = 1 << 20
+
+def _wav_buffer(samples: np.ndarray, name: str) -> io.BytesIO:
+    """Encode samples as a named in-memory WAV; the Groq client only needs a file-like"""
+    buffer = io.BytesIO()
+    sf.write(buffer, samples, _SAMPLE_RATE, format='WAV', subtype='PCM_16')
+    buffer.seek(0)
+    buffer.name = name
+    return buffer
+
+def _as_dict(transcription) -> Dict[str, Any]:
+    """Plain-dict form of a Groq transcription response, suitable for JSON caching"""
+    if isinstance(transcription, dict):
+        return transcription
+    if hasattr(transcription, 'model_dump'):
+        return transcription.model_dump()
+    return transcription.to_dict()
+
+@dataclass(**_DATACLASS_OPTIONS)
 class TranscriptSegment:
     """Represents a transcribed speech segment"""
     start_time: float
@@ -25,10 +69,19 @@ class TranscriptSegment:
     def duration(self) -> float:
         return self.end_time - self.start_time
 
-class SpeechProcessor:
+class SpeechProcessor(TranscriptLookupMixin):
     """Handles audio extraction and speech-to-text conversion using Groq API"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, max_workers: int = 8, max_retries: int = 3,
+                 cache_dir: Optional[str] = None):
+        # Concurrent Groq requests and retries for rate-limit/server errors
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        # Transcripts cached on disk by content hash, shared across runs
+        self.cache_dir = cache_dir or os.getenv('TRANSCRIPT_CACHE_DIR', _DEFAULT_CACHE_DIR)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache_lock = threading.Lock()
         self.api_key = api_key or os.getenv('GROQ_API_KEY')
         if not self.api_key:
             raise ValueError("Groq API key not found. Set GROQ_API_KEY environment variable.")
@@ -52,16 +105,22 @@ class SpeechProcessor:
         try:
             logger.info(f"Extracting audio from {video_path}")
             
-            # Load video and extract audio
-            video = VideoFileClip(video_path)
-            audio = video.audio
-            
-            # Write audio to file
-            audio.write_audiofile(output_path, verbose=False, logger=None)
+            # Use FFmpeg to extract 16kHz mono PCM, the format Whisper works on
+            cmd = [
+                'ffmpeg',
+                '-i', video_path,
+                '-vn',  # No video
+                '-acodec', 'pcm_s16le',  # PCM 16-bit
+                '-ar', '16000',  # 16kHz sample rate (optimal for speech)
+                '-ac', '1',  # Mono
+                '-y',  # Overwrite output file
+                output_path
+            ]
             
-            # Clean up
-            audio.close()
-            video.close()
+            try:
+                subprocess.run(cmd, check=True, capture_output=True)
+            except subprocess.CalledProcessError as e:
+                raise RuntimeError(f"FFmpeg error: {e.stderr.decode(errors='replace')}") from e
             
             logger.info(f"Audio extracted to {output_path}")
             return output_path
@@ -70,30 +129,32 @@ class SpeechProcessor:
             logger.error(f"Error extracting audio: {e}")
             raise
     
-    def split_audio_chunks(self, audio_path: str, chunk_duration: int = 30) -> List[Tuple[str, float, float]]:
-        """Split audio into chunks for processing"""
+    def split_audio_chunks(self, audio_path: str, chunk_duration: int = 30) -> List[Tuple[io.BytesIO, float, float]]:
+        """Split audio into in-memory WAV chunks for processing"""
         try:
-            # Load audio file
-            y, sr = librosa.load(audio_path, sr=None)
-            duration = len(y) / sr
-            
             chunks = []
-            chunk_files = []
             
-            for start_time in range(0, int(duration), chunk_duration):
-                end_time = min(start_time + chunk_duration, duration)
-                
-                # Extract chunk
-                start_sample = int(start_time * sr)
-                end_sample = int(end_time * sr)
-                chunk_audio = y[start_sample:end_sample]
-                
-                # Save chunk to temporary file
-                chunk_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-                sf.write(chunk_file.name, chunk_audio, sr)
+            # Read each chunk's 16-bit PCM samples straight from the file; the whole track is never held in memory
+            with sf.SoundFile(audio_path) as audio_file:
+                sr = audio_file.samplerate
+                duration = audio_file.frames / sr
                 
-                chunks.append((chunk_file.name, start_time, end_time))
-                chunk_files.append(chunk_file.name)
+                for start_time in range(0, int(duration), chunk_duration):
+                    end_time = min(start_time + chunk_duration, duration)
+                    
+                    # Extract chunk
+                    start_sample = int(start_time * sr)
+                    end_sample = int(end_time * sr)
+                    audio_file.seek(start_sample)
+                    chunk_audio = audio_file.read(end_sample - start_sample, dtype='int16')
+                    
+                    # Encode chunk as WAV in memory; the Groq client only needs a file-like
+                    chunk_buffer = io.BytesIO()
+                    sf.write(chunk_buffer, chunk_audio, sr, format='WAV', subtype='PCM_16')
+                    chunk_buffer.seek(0)
+                    chunk_buffer.name = f"chunk_{start_time:06d}.wav"
+                    
+                    chunks.append((chunk_buffer, start_time, end_time))
             
             logger.info(f"Split audio into {len(chunks)} chunks")
             return chunks
@@ -102,119 +163,291 @@ class SpeechProcessor:
             logger.error(f"Error splitting audio: {e}")
             raise
     
-    def transcribe_audio_chunk(self, audio_path: str) -> Dict[str, Any]:
-        """Transcribe a single audio chunk using Groq API"""
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def _cache_get(self, key: str) -> Optional[Any]:
+        """Cached JSON value for key, counting the hit or miss"""
+        try:
+            with open(self._cache_path(key), 'rb') as cache_file:
+                value = json.loads(cache_file.read())
+        except (OSError, ValueError):
+            value = None
+        
+        with self._cache_lock:
+            if value is None:
+                self.cache_misses += 1
+            else:
+                self.cache_hits += 1
+        return value
+    
+    def _cache_put(self, key: str, value: Any):
+        """Write a cache entry atomically so concurrent runs never see partial files"""
         try:
-            with open(audio_path, 'rb') as audio_file:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=self.cache_dir)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as cache_file:
+                    json.dump(value, cache_file)
+                os.replace(temp_path, self._cache_path(key))
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except Exception as e:
+            logger.warning(f"Could not write transcript cache entry {key}: {e}")
+    
+    def _video_cache_key(self, video_path: str) -> str:
+        """Whole-video key from size, mtime and the leading bytes of the file"""
+        stat = os.stat(video_path)
+        digest = hashlib.blake2b(_CACHE_KEY_PREFIX, digest_size=20)
+        digest.update(f"{stat.st_size}|{stat.st_mtime_ns}|".encode())
+        with open(video_path, 'rb') as video_file:
+            digest.update(video_file.read(_VIDEO_KEY_BYTES))
+        return "video-" + digest.hexdigest()
+    
+    def stream_audio_chunks(self, video_path: str, chunk_duration: int = 30) -> Iterator[Tuple[io.BytesIO, float, float]]:
+        """Yield in-memory WAV chunks while FFmpeg is still decoding the rest of the audio"""
+        return self._wav_chunks(self._stream_pcm(video_path, chunk_duration * _SAMPLE_RATE))
+    
+    def _stream_pcm(self, video_path: str, chunk_samples: int) -> Iterator[np.ndarray]:
+        """Raw 16kHz mono int16 samples from FFmpeg, chunk_samples at a time"""
+        cmd = [
+            'ffmpeg',
+            '-nostdin',
+            '-loglevel', 'error',
+            '-i', video_path,
+            '-vn',  # No video
+            '-acodec', 'pcm_s16le',  # PCM 16-bit
+            '-ar', str(_SAMPLE_RATE),  # 16kHz sample rate (optimal for speech)
+            '-ac', '1',  # Mono
+            '-f', 's16le',  # Raw samples on stdout
+            '-'
+        ]
+        
+        # stderr goes to a file so a chatty FFmpeg can never block on a full pipe
+        with tempfile.TemporaryFile() as stderr_file:
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file)
+            total_samples = 0
+            try:
+                while True:
+                    data = process.stdout.read(chunk_samples * 2)
+                    if len(data) < 2:
+                        break
+                    samples = np.frombuffer(data, dtype=np.int16, count=len(data) // 2)
+                    total_samples += len(samples)
+                    yield samples
+            except BaseException:
+                process.kill()
+                raise
+            finally:
+                process.stdout.close()
+                returncode = process.wait()
+            
+            if returncode != 0:
+                stderr_file.seek(0)
+                message = stderr_file.read().decode(errors='replace')
+                if total_samples == 0:
+                    raise RuntimeError(f"FFmpeg error: {message}")
+                logger.warning(f"FFmpeg exited with code {returncode} after {total_samples / _SAMPLE_RATE:.1f}s of audio: {message}")
+    
+    def _wav_chunks(self, pcm_chunks: Iterable[np.ndarray]) -> Iterator[Tuple[io.BytesIO, float, float]]:
+        """Wrap consecutive sample chunks as named in-memory WAVs with their start and end times"""
+        start_sample = 0
+        for samples in pcm_chunks:
+            # Like split_audio_chunks, a trailing chunk needs at least one second of audio
+            if len(samples) < _SAMPLE_RATE:
+                break
+            
+            start_time = start_sample // _SAMPLE_RATE
+            start_sample += len(samples)
+            yield _wav_buffer(samples, f"chunk_{start_time:06d}.wav"), start_time, start_sample / _SAMPLE_RATE
+    
+    def transcribe_audio_chunk(self, audio: Union[str, io.BytesIO]) -> Dict[str, Any]:
+        """Transcribe a single audio chunk (file path or in-memory WAV) using Groq API"""
+        try:
+            return self._transcribe_or_raise(audio)
+        except Exception as e:
+            chunk_name = audio if isinstance(audio, str) else getattr(audio, 'name', 'chunk.wav')
+            logger.error(f"Error transcribing audio chunk {chunk_name}: {e}")
+            return {"text": "", "segments": []}
+    
+    def _transcribe_or_raise(self, audio: Union[str, io.BytesIO]) -> Dict[str, Any]:
+        """Cached or fresh transcription of one chunk, raising once retries are exhausted"""
+        chunk_name = audio if isinstance(audio, str) else getattr(audio, 'name', 'chunk.wav')
+        if isinstance(audio, str):
+            with open(audio, 'rb') as audio_file:
+                audio_bytes = audio_file.read()
+        else:
+            audio_bytes = audio.getvalue()
+        
+        # Identical audio has already been transcribed on an earlier run
+        key = hashlib.blake2b(_CACHE_KEY_PREFIX + audio_bytes, digest_size=20).hexdigest()
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        for attempt in range(self.max_retries + 1):
+            try:
                 # Use Groq's Whisper model for transcription
                 transcription = self.client.audio.transcriptions.create(
-                    file=audio_file,
-                    model="whisper-large-v3",
+                    file=(os.path.basename(chunk_name), audio_bytes),
+                    model=_TRANSCRIPTION_MODEL,
                     response_format="verbose_json",
-                    language="en"  # Can be made configurable
+                    language=_TRANSCRIPTION_LANGUAGE  # Can be made configurable
                 )
-                
-            return transcription
-            
-        except Exception as e:
-            logger.error(f"Error transcribing audio chunk {audio_path}: {e}")
-            return {"text": "", "segments": []}
+                break
+            except Exception as e:
+                if attempt == self.max_retries or not self._is_retryable(e):
+                    raise
+                delay = 2 ** attempt
+                logger.warning(f"Groq request for {chunk_name} failed ({e}); retrying in {delay}s")
+                time.sleep(delay)
+        
+        # Hits come back as plain dicts, so misses are returned the same way
+        transcription = _as_dict(transcription)
+        self._cache_put(key, transcription)
+        return transcription
     
-    def process_video_audio(self, video_path: str) -> List[TranscriptSegment]:
-        """Process entire video audio and return transcript segments"""
-        transcript_segments = []
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Rate limits, server errors and connection failures are worth retrying"""
+        status = getattr(error, 'status_code', None)
+        if status is not None:
+            return status == 429 or status >= 500
+        return type(error).__name__ in ('APIConnectionError', 'APITimeoutError')
+    
+    def _segments_from_transcription(self, transcription, chunk_start: float) -> List[TranscriptSegment]:
+        """Convert one chunk's Groq response into globally timed transcript segments"""
+        if not transcription or 'segments' not in transcription:
+            return []
+        
+        # Pull each segment's fields once, stripping the text a single time
+        fields = [
+            (segment.get('start', 0), segment.get('end', 0), segment.get('text', '').strip(), segment.get('avg_logprob', 0.0))
+            for segment in transcription['segments']
+        ]
+        
+        # Adjust timestamps to global video time, keeping only non-empty segments
+        return [
+            TranscriptSegment(chunk_start + start, chunk_start + end, text, confidence)
+            for start, end, text, confidence in fields
+            if text
+        ]
+    
+    def _transcribe_whole(self, pcm_chunks: List[np.ndarray]) -> Optional[List[TranscriptSegment]]:
+        """Transcribe all of the audio in one request; None if that fails and chunking should be tried"""
+        if not pcm_chunks:
+            return []
         
+        logger.info("Transcribing audio in a single request")
         try:
-            # Extract audio from video
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
-                audio_path = self.extract_audio(video_path, temp_audio.name)
-            
-            # Split audio into chunks
-            audio_chunks = self.split_audio_chunks(audio_path)
+            transcription = self._transcribe_or_raise(_wav_buffer(np.concatenate(pcm_chunks), "audio.wav"))
+        except Exception as e:
+            logger.warning(f"Single-request transcription failed ({e}); retrying in chunks")
+            return None
+        return self._segments_from_transcription(transcription, 0.0)
+    
+    def _transcribe_chunks(self, pcm_chunks: Iterable[np.ndarray]) -> Tuple[List[TranscriptSegment], bool]:
+        """Transcribe fixed-length chunks concurrently; also reports whether every chunk succeeded"""
+        # Chunks are independent network calls, so transcribe each one as soon as FFmpeg has produced it
+        audio_chunks = []
+        futures = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for i, (chunk_audio, chunk_start, chunk_end) in enumerate(self._wav_chunks(pcm_chunks)):
+                logger.info(f"Transcribing chunk {i+1} ({chunk_start:.1f}s - {chunk_end:.1f}s)")
+                audio_chunks.append((chunk_audio, chunk_start, chunk_end))
+                futures[executor.submit(self._transcribe_or_raise, chunk_audio)] = i
             
             logger.info(f"Processing {len(audio_chunks)} audio chunks...")
             
-            for i, (chunk_path, chunk_start, chunk_end) in enumerate(audio_chunks):
-                logger.info(f"Transcribing chunk {i+1}/{len(audio_chunks)} ({chunk_start:.1f}s - {chunk_end:.1f}s)")
-                
-                # Transcribe chunk
-                transcription = self.transcribe_audio_chunk(chunk_path)
-                
-                if transcription and 'segments' in transcription:
-                    # Process segments from Groq response
-                    for segment in transcription['segments']:
-                        # Adjust timestamps to global video time
-                        global_start = chunk_start + segment.get('start', 0)
-                        global_end = chunk_start + segment.get('end', 0)
-                        
-                        transcript_segment = TranscriptSegment(
-                            start_time=global_start,
-                            end_time=global_end,
-                            text=segment.get('text', '').strip(),
-                            confidence=segment.get('avg_logprob', 0.0)
-                        )
-                        
-                        if transcript_segment.text:  # Only add non-empty segments
-                            transcript_segments.append(transcript_segment)
-                
-                # Clean up chunk file
+            chunk_segments = [None] * len(audio_chunks)
+            transcription_ok = [True] * len(audio_chunks)
+            for future in as_completed(futures):
+                i = futures[future]
                 try:
-                    os.unlink(chunk_path)
-                except:
-                    pass
+                    transcription = future.result()
+                except Exception as e:
+                    logger.error(f"Error transcribing audio chunk {audio_chunks[i][0].name}: {e}")
+                    transcription = None
+                    transcription_ok[i] = False
+                chunk_segments[i] = self._segments_from_transcription(transcription, audio_chunks[i][1])
+        
+        # Completion order is arbitrary; merge back in chunk order
+        transcript_segments = []
+        for segments in chunk_segments:
+            transcript_segments.extend(segments)
+        return transcript_segments, all(transcription_ok)
+    
+    def process_video_audio(self, video_path: str) -> List[TranscriptSegment]:
+        """Process entire video audio and return transcript segments"""
+        try:
+            # An unchanged video needs neither audio extraction nor any API calls
+            video_key = self._video_cache_key(video_path)
+            cached = self._cache_get(video_key)
+            if cached is not None:
+                logger.info(f"Using cached transcript for {video_path}")
+                return [TranscriptSegment(**fields) for fields in cached]
             
-            # Clean up main audio file
-            try:
-                os.unlink(audio_path)
-            except:
-                pass
+            # Buffer audio until it is clear whether it fits in a single upload
+            chunk_samples = self.chunk_duration * _SAMPLE_RATE
+            pcm_chunks = self._stream_pcm(video_path, chunk_samples)
+            buffered = []
+            buffered_samples = 0
+            transcript_segments = None
+            for samples in pcm_chunks:
+                buffered.append(samples)
+                buffered_samples += len(samples)
+                if buffered_samples > _SINGLE_REQUEST_SAMPLES:
+                    break
+            else:
+                # Short audio: one round-trip, timestamps are already global
+                transcript_segments = self._transcribe_whole(buffered)
+                pcm_chunks = iter(())
+            
+            # Long audio, or a failed single request: transcribe chunk by chunk as FFmpeg produces it
+            complete = True
+            if transcript_segments is None:
+                transcript_segments, complete = self._transcribe_chunks(itertools.chain(buffered, pcm_chunks))
+            
+            # Only cache complete runs; failed chunks come back empty and should be retried next time
+            if complete:
+                self._cache_put(video_key, [
+                    {'start_time': seg.start_time, 'end_time': seg.end_time, 'text': seg.text,
+                     'confidence': seg.confidence, 'speaker': seg.speaker}
+                    for seg in transcript_segments
+                ])
             
             logger.info(f"Transcription complete: {len(transcript_segments)} segments")
+            logger.info(f"Transcript cache: {self.cache_hits} hits, {self.cache_misses} misses")
             return transcript_segments
             
         except Exception as e:
             logger.error(f"Error processing video audio: {e}")
             raise
     
-    def get_transcript_for_timerange(self, transcript_segments: List[TranscriptSegment], 
-                                   start_time: float, end_time: float) -> str:
-        """Get transcript text for a specific time range"""
-        relevant_segments = []
-        
-        for segment in transcript_segments:
-            # Check if segment overlaps with the time range
-            if (segment.start_time < end_time and segment.end_time > start_time):
-                relevant_segments.append(segment)
-        
-        # Sort by start time
-        relevant_segments.sort(key=lambda x: x.start_time)
-        
-        # Combine text
-        transcript_text = " ".join([seg.text for seg in relevant_segments])
-        return transcript_text.strip()
-    
     def analyze_speech_patterns(self, transcript_segments: List[TranscriptSegment]) -> Dict[str, Any]:
         """Analyze speech patterns for insights"""
         if not transcript_segments:
             return {}
         
-        total_duration = max(seg.end_time for seg in transcript_segments)
-        total_speech_time = sum(seg.duration for seg in transcript_segments)
+        # Shares the column arrays built for time-range lookups
+        index = self._index_for(transcript_segments)
+        segments = index.array
+        _, total_speech_time, total_duration, _, _, _ = segments.reduce()
         
         # Calculate speaking rate (words per minute)
-        total_words = sum(len(seg.text.split()) for seg in transcript_segments)
+        total_words = int(index.word_counts.sum())
         speaking_rate = (total_words / (total_speech_time / 60)) if total_speech_time > 0 else 0
         
         # Find pauses (gaps between segments)
-        pauses = []
-        for i in range(len(transcript_segments) - 1):
-            gap = transcript_segments[i + 1].start_time - transcript_segments[i].end_time
-            if gap > 1.0:  # Pauses longer than 1 second
-                pauses.append({
-                    'start': transcript_segments[i].end_time,
-                    'end': transcript_segments[i + 1].start_time,
-                    'duration': gap
-                })
+        gap_ends = segments.starts[1:]
+        gap_starts = segments.ends[:-1]
+        gaps = gap_ends - gap_starts
+        pause_mask = gaps > 1.0  # Pauses longer than 1 second
+        pauses = [
+            {'start': start, 'end': end, 'duration': gap}
+            for start, end, gap in zip(gap_starts[pause_mask].tolist(), gap_ends[pause_mask].tolist(), gaps[pause_mask].tolist())
+        ]
         
         return {
             'total_duration': total_duration,
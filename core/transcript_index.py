@@ -0,0 +1,64 @@
+import logging
+from typing import List, Sequence
+import numpy as np
+from .segment_array import SegmentArray
+
+logger = logging.getLogger(__name__)
+
+class TranscriptIndex:
+    """Start-sorted column view of transcript segments for fast time-range lookups"""
+    
+    def __init__(self, transcript_segments: Sequence):
+        self.segments = transcript_segments
+        self.length = len(transcript_segments)
+        self.array = SegmentArray.from_list(transcript_segments, fields=('text',))
+        
+        # Stable sort keeps equal start times in their original order
+        order = np.argsort(self.array.starts, kind='stable')
+        texts = self.array.columns['text']
+        self.starts = self.array.starts[order]
+        self.ends = self.array.ends[order]
+        self.texts = [texts[i] for i in order.tolist()]
+        
+        # Words per segment, counted once for the speech-pattern statistics
+        self.word_counts = np.fromiter((len(text.split()) for text in texts), dtype=np.int64, count=self.length)
+        
+        # Running maximum of end times; monotonic even when segments overlap
+        self._reach = np.maximum.accumulate(self.ends) if self.length else self.ends
+    
+    def covers(self, transcript_segments: Sequence) -> bool:
+        """Whether this index was built from (and still matches the length of) the given list"""
+        return transcript_segments is self.segments and len(transcript_segments) == self.length
+    
+    def overlapping(self, start_time: float, end_time: float) -> np.ndarray:
+        """Sorted positions of segments overlapping (start_time, end_time)"""
+        # Everything before lo ends at or before start_time; everything from hi starts too late
+        lo = int(np.searchsorted(self._reach, start_time, side='right'))
+        hi = int(np.searchsorted(self.starts, end_time, side='left'))
+        if lo >= hi:
+            return np.empty(0, dtype=np.intp)
+        
+        window = np.arange(lo, hi)
+        return window[self.ends[lo:hi] > start_time]
+    
+    def text_for_range(self, start_time: float, end_time: float) -> str:
+        """Joined text of the segments overlapping the time range"""
+        texts = self.texts
+        return " ".join([texts[i] for i in self.overlapping(start_time, end_time).tolist()]).strip()
+
+class TranscriptLookupMixin:
+    """get_transcript_for_timerange for speech processors, backed by a TranscriptIndex of the last transcript queried"""
+    
+    _transcript_index = None
+    
+    def _index_for(self, transcript_segments: List) -> TranscriptIndex:
+        """Column arrays and sorted index for a transcript, reused while the same list is passed in"""
+        index = self._transcript_index
+        if index is None or not index.covers(transcript_segments):
+            index = self._transcript_index = TranscriptIndex(transcript_segments)
+        return index
+    
+    def get_transcript_for_timerange(self, transcript_segments: List,
+                                     start_time: float, end_time: float) -> str:
+        """Get transcript text for a specific time range"""
+        return self._index_for(transcript_segments).text_for_range(start_time, end_time)
@@ -2,14 +2,236 @@ import cv2
 import numpy as np
 from PIL import Image
 import os
-from typing import List, Tuple, Dict, Any
+import hashlib
+from typing import List, Tuple, Dict, Any, Iterable, Iterator, Optional
 from dataclasses import dataclass
-from skimage.metrics import structural_similarity as ssim
+from functools import lru_cache
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Frames are compared as 640x480 grayscale
+_COMPARE_SIZE = (640, 480)
+
+# SSIM parameters matching scikit-image's structural_similarity defaults for uint8 input
+_SSIM_WIN = 7
+_SSIM_C1 = (0.01 * 255) ** 2
+_SSIM_C2 = (0.03 * 255) ** 2
+_SSIM_COV_NORM = _SSIM_WIN * _SSIM_WIN / (_SSIM_WIN * _SSIM_WIN - 1.0)
+
+# A seek makes OpenCV's FFmpeg backend jump back to the nearest keyframe and decode forward from
+# there, so one seek can cost up to a full GOP. Sampling seeks only when samples are at least this
+# many frames apart and no closer than the keyframe spacing; otherwise sequential grab() is cheaper
+_SEEK_MIN_FRAMES = 24
+
+# Keyframe spacing is probed from the first few keyframes, reading at most this many sampling intervals
+_GOP_PROBE_KEYFRAMES = 4
+_GOP_PROBE_INTERVALS = 4
+
+def _keyframe_interval(video_path: str, max_packets: int) -> Optional[float]:
+    """Mean frames between keyframes near the start, from undecoded packets; at least max_packets if under two turn up"""
+    has_key_frame = getattr(cv2, 'CAP_PROP_LRF_HAS_KEY_FRAME', None)
+    if has_key_frame is None:
+        # Raw packet access needs OpenCV 4.5+
+        return None
+    
+    try:
+        cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG, [cv2.CAP_PROP_FORMAT, -1])
+    except cv2.error:
+        return None
+    
+    keyframes = []
+    try:
+        if not cap.isOpened() or cap.get(cv2.CAP_PROP_FORMAT) != -1:
+            return None
+        
+        # grab() in raw mode only demuxes, so this costs file reads but no decoding
+        packets = 0
+        while packets < max_packets and len(keyframes) < _GOP_PROBE_KEYFRAMES and cap.grab():
+            if cap.get(has_key_frame):
+                keyframes.append(packets)
+            packets += 1
+    finally:
+        cap.release()
+    
+    if len(keyframes) < 2:
+        return float(max_packets)
+    return (keyframes[-1] - keyframes[0]) / (len(keyframes) - 1)
+
+class _SeekUnreliable(Exception):
+    """The container cannot seek to exact frame numbers"""
+
+def _read_frame_at(cap: cv2.VideoCapture, frame_number: int) -> Optional[np.ndarray]:
+    """Seek to and decode one frame; None past the end of the stream"""
+    if not cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number):
+        raise _SeekUnreliable("Frame seeking not supported")
+    
+    ret, frame = cap.read()
+    if not ret:
+        return None
+    
+    # The decoder must land exactly on the requested frame
+    if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != frame_number + 1:
+        raise _SeekUnreliable("Frame seeking is inaccurate for this video")
+    return frame
+
+# dHash compares horizontally adjacent pixels of a 9x8 thumbnail, giving 64 bits per frame
+_DHASH_SIZE = (9, 8)
+_DHASH_BITS = 64
+
+def _dhash(img: np.ndarray) -> int:
+    """64-bit difference hash of a grayscale image"""
+    small = cv2.resize(img, _DHASH_SIZE, interpolation=cv2.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+# Grayscale histogram bins for the SSIM prefilter
+_GRAY_HIST_BINS = 64
+
+# Joint BGR histogram: 8 bins per channel, 512 in total
+_HIST_BINS = [8, 8, 8]
+_HIST_RANGES = [0, 256] * 3
+
+def _color_histogram(img: np.ndarray) -> np.ndarray:
+    """Joint 3D colour histogram of a BGR image in a single calcHist pass"""
+    return cv2.calcHist([img], [0, 1, 2], None, _HIST_BINS, _HIST_RANGES)
+
+def _load_gray(image_path: str) -> Optional[np.ndarray]:
+    """Read an image as grayscale at the comparison size, or None if unreadable"""
+    img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+    if img is None:
+        return None
+    return cv2.resize(img, _COMPARE_SIZE)
+
+class _SSIMKernel:
+    """Box-filter SSIM specialised to fixed-size grayscale frames, computed in preallocated float32 buffers"""
+    
+    def __init__(self, size: Tuple[int, int] = _COMPARE_SIZE):
+        width, height = size
+        shape = (height, width)
+        # Two sets of (image, local mean, local variance), for the previous and the current frame
+        self._slots = [tuple(np.empty(shape, dtype=np.float32) for _ in range(3)) for _ in range(2)]
+        self._current = 0
+        self._scratch = [np.empty(shape, dtype=np.float32) for _ in range(3)]
+    
+    def push(self, img: np.ndarray):
+        """Compute the moments of the next frame; the previously pushed frame stays available"""
+        self._current ^= 1
+        x, mu, var = self._slots[self._current]
+        tmp = self._scratch[0]
+        window = (_SSIM_WIN, _SSIM_WIN)
+        
+        np.copyto(x, img)
+        cv2.boxFilter(x, -1, window, dst=mu, borderType=cv2.BORDER_REFLECT)
+        cv2.multiply(x, x, dst=tmp)
+        cv2.boxFilter(tmp, -1, window, dst=var, borderType=cv2.BORDER_REFLECT)
+        cv2.multiply(mu, mu, dst=tmp)
+        cv2.subtract(var, tmp, dst=var)
+        var *= _SSIM_COV_NORM
+    
+    def similarity(self) -> float:
+        """Mean SSIM between the last two pushed frames"""
+        x, mu_x, var_x = self._slots[self._current ^ 1]
+        y, mu_y, var_y = self._slots[self._current]
+        num, den, tmp = self._scratch
+        window = (_SSIM_WIN, _SSIM_WIN)
+        
+        # Covariance term, the only filter that depends on both frames
+        cv2.multiply(x, y, dst=tmp)
+        cv2.boxFilter(tmp, -1, window, dst=den, borderType=cv2.BORDER_REFLECT)
+        cv2.multiply(mu_x, mu_y, dst=num)
+        cv2.subtract(den, num, dst=den)
+        
+        # (2*mu_x*mu_y + C1) * (2*cov + C2)
+        num *= 2
+        num += _SSIM_C1
+        den *= 2 * _SSIM_COV_NORM
+        den += _SSIM_C2
+        num *= den
+        
+        # (mu_x^2 + mu_y^2 + C1) * (var_x + var_y + C2)
+        cv2.multiply(mu_x, mu_x, dst=den)
+        cv2.multiply(mu_y, mu_y, dst=tmp)
+        den += tmp
+        den += _SSIM_C1
+        cv2.add(var_x, var_y, dst=tmp)
+        tmp += _SSIM_C2
+        den *= tmp
+        num /= den
+        
+        # Ignore the border where the window would read padding
+        pad = (_SSIM_WIN - 1) // 2
+        return float(num[pad:-pad, pad:-pad].mean(dtype=np.float64))
+
+class _CudaSSIMKernel:
+    """GPU version of _SSIMKernel using OpenCV's CUDA filters and arithmetic"""
+    
+    def __init__(self, size: Tuple[int, int] = _COMPARE_SIZE):
+        width, height = size
+        self._box = cv2.cuda.createBoxFilter(cv2.CV_32FC1, cv2.CV_32FC1, (_SSIM_WIN, _SSIM_WIN),
+                                             borderMode=cv2.BORDER_REFLECT)
+        
+        # Interior mask excluding the border where the window would read padding
+        pad = (_SSIM_WIN - 1) // 2
+        mask = np.zeros((height, width), dtype=np.uint8)
+        mask[pad:-pad, pad:-pad] = 255
+        self._mask = cv2.cuda_GpuMat()
+        self._mask.upload(mask)
+        self._count = float((height - 2 * pad) * (width - 2 * pad))
+        
+        self._prev = None
+        self._current = None
+    
+    def push(self, img: np.ndarray):
+        """Upload the next frame and compute its moments on the device"""
+        gpu_img = cv2.cuda_GpuMat()
+        gpu_img.upload(img)
+        x = gpu_img.convertTo(cv2.CV_32F)
+        mu = self._box.apply(x)
+        mean_sq = self._box.apply(cv2.cuda.multiply(x, x))
+        var = cv2.cuda.addWeighted(mean_sq, _SSIM_COV_NORM, cv2.cuda.multiply(mu, mu), -_SSIM_COV_NORM, 0.0)
+        self._prev, self._current = self._current, (x, mu, var)
+    
+    def similarity(self) -> float:
+        """Mean SSIM between the last two pushed frames"""
+        x, mu_x, var_x = self._prev
+        y, mu_y, var_y = self._current
+        
+        mu_xy = cv2.cuda.multiply(mu_x, mu_y)
+        mean_xy = self._box.apply(cv2.cuda.multiply(x, y))
+        
+        # (2*mu_x*mu_y + C1) * (2*cov + C2)
+        num = cv2.cuda.multiply(
+            cv2.cuda.addWeighted(mu_xy, 2.0, mu_xy, 0.0, _SSIM_C1),
+            cv2.cuda.addWeighted(mean_xy, 2 * _SSIM_COV_NORM, mu_xy, -2 * _SSIM_COV_NORM, _SSIM_C2)
+        )
+        
+        # (mu_x^2 + mu_y^2 + C1) * (var_x + var_y + C2)
+        den = cv2.cuda.multiply(
+            cv2.cuda.addWeighted(cv2.cuda.multiply(mu_x, mu_x), 1.0, cv2.cuda.multiply(mu_y, mu_y), 1.0, _SSIM_C1),
+            cv2.cuda.addWeighted(var_x, 1.0, var_y, 1.0, _SSIM_C2)
+        )
+        
+        return cv2.cuda.sum(cv2.cuda.divide(num, den), self._mask)[0] / self._count
+
+@lru_cache(maxsize=1)
+def _cuda_available() -> bool:
+    """Whether OpenCV was built with CUDA and can see a device; checked once per process"""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+def _make_ssim_kernel():
+    """SSIM kernel on the GPU when one is usable, otherwise on the CPU"""
+    if _cuda_available():
+        try:
+            return _CudaSSIMKernel()
+        except cv2.error as e:
+            logger.warning(f"CUDA SSIM unavailable, using CPU: {e}")
+    return _SSIMKernel()
+
 @dataclass
 class ScreenSegment:
     """Represents a unique screen segment with its metadata"""
@@ -28,70 +250,186 @@ class ScreenSegment:
 class VideoAnalyzer:
     """Core video analysis engine for detecting screen changes"""
     
-    def __init__(self, similarity_threshold: float = 0.85, min_duration: float = 2.0):
-        self.similarity_threshold = similarity_threshold
+    def __init__(self, similarity_threshold: float = 0.85, min_duration: float = 2.0, use_ssim: bool = True,
+                 histogram_skip_threshold: Optional[float] = None, hash_max_distance: int = 10):
+        self.similarity_threshold = similarity_threshold  # SSIM below this is a screen change
         self.min_duration = min_duration  # Minimum duration for a screen segment
         self.frame_interval = 1.0  # Check every 1 second like reference code
-        
-    def extract_frames(self, video_path: str, output_dir: str) -> List[Tuple[int, float, str]]:
-        """Extract frames from video and return frame info"""
+        self.use_ssim = use_ssim  # False trades accuracy for speed by comparing perceptual hashes
+        # Opt-in: histogram correlation above which SSIM is skipped. Text slides on the same
+        # background have near-identical histograms, so this can merge different slides
+        self.histogram_skip_threshold = histogram_skip_threshold
+        self.hash_max_distance = hash_max_distance  # Hash mode: more differing bits than this is a screen change
+    
+    def extract_frames(self, video_path: str) -> Iterator[Tuple[int, float, np.ndarray]]:
+        """Sample frames from video, yielding (frame number, timestamp, grayscale comparison image) as they are decoded"""
         cap = cv2.VideoCapture(video_path)
         if not cap.isOpened():
             raise ValueError(f"Could not open video file: {video_path}")
         
         fps = cap.get(cv2.CAP_PROP_FPS)
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        
-        frames_info = []
-        frame_count = 0
         frame_interval_frames = int(fps * self.frame_interval)
         
         logger.info(f"Processing video: {total_frames} frames at {fps} FPS, checking every {self.frame_interval}s")
         
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
+        # Two alternating buffers: each yielded image stays valid while the following sample is compared with it
+        width, height = _COMPARE_SIZE
+        buffers = np.empty((2, height, width), dtype=np.uint8)
+        sampled = 0
+        next_frame = 0
+        try:
+            # Seek straight to each sample instead of decoding the frames in between
+            if total_frames > 0 and self._seeking_pays_off(video_path, frame_interval_frames):
+                samples = self._sample_by_seeking(cap, total_frames, frame_interval_frames)
+            else:
+                samples = self._sample_sequentially(cap, total_frames, frame_interval_frames)
+            
+            while True:
+                try:
+                    frame_count, frame = next(samples)
+                except StopIteration:
+                    break
+                except _SeekUnreliable as e:
+                    # Samples read so far were exact; decode from the start up to where seeking failed
+                    logger.info(f"{e}, decoding sequentially")
+                    cap.release()
+                    cap = cv2.VideoCapture(video_path)
+                    samples = self._sample_sequentially(cap, total_frames, frame_interval_frames, next_frame)
+                    continue
                 
+                gray = buffers[sampled % 2]
+                cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), _COMPARE_SIZE, dst=gray)
+                sampled += 1
+                next_frame = frame_count + 1
+                yield frame_count, frame_count / fps, gray
+        finally:
+            cap.release()
+        
+        logger.info(f"Extracted {sampled} frames for analysis")
+    
+    def _seeking_pays_off(self, video_path: str, frame_interval_frames: int) -> bool:
+        """Whether seeking to each sample should beat decoding every frame, judged against the keyframe spacing"""
+        if frame_interval_frames < _SEEK_MIN_FRAMES:
+            return False
+        
+        keyframe_interval = _keyframe_interval(video_path, _GOP_PROBE_INTERVALS * frame_interval_frames)
+        if keyframe_interval is None:
+            # Spacing unknown; the frame-count floor alone decides
+            return True
+        
+        if keyframe_interval > frame_interval_frames:
+            logger.info(f"Keyframes every ~{keyframe_interval:.0f} frames, sampling every {frame_interval_frames}; "
+                        "decoding sequentially instead of seeking")
+            return False
+        return True
+    
+    def _sample_by_seeking(self, cap: cv2.VideoCapture, total_frames: int,
+                           frame_interval_frames: int) -> Iterator[Tuple[int, np.ndarray]]:
+        """Read one frame per interval by seeking; raises _SeekUnreliable if the container does not seek accurately"""
+        for sampled, frame_count in enumerate(range(0, total_frames, frame_interval_frames), start=1):
+            frame = _read_frame_at(cap, frame_count)
+            if frame is None:
+                # Frame counts from container metadata can overshoot the real stream
+                break
+            
+            yield frame_count, frame
+            
+            # Progress logging
+            if sampled % 100 == 0:
+                progress = (frame_count / total_frames) * 100
+                logger.info(f"Processed {frame_count}/{total_frames} frames ({progress:.1f}%)")
+    
+    def _sample_sequentially(self, cap: cv2.VideoCapture, total_frames: int, frame_interval_frames: int,
+                             first_frame: int = 0) -> Iterator[Tuple[int, np.ndarray]]:
+        """Walk every frame, decoding only one per interval from first_frame on"""
+        frame_count = 0
+        frame_interval_frames = max(1, frame_interval_frames)
+        
+        # grab() advances without the colour conversion that retrieve() does for sampled frames
+        while cap.grab():
             # Process frames at specified intervals (like reference code)
-            if frame_count % frame_interval_frames == 0:
-                timestamp = frame_count / fps
-                frame_path = os.path.join(output_dir, f"frame_{frame_count:06d}.jpg")
-                
-                # Save frame
-                cv2.imwrite(frame_path, frame)
-                frames_info.append((frame_count, timestamp, frame_path))
-                
+            if frame_count >= first_frame and frame_count % frame_interval_frames == 0:
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                yield frame_count, frame
+            
             frame_count += 1
             
             # Progress logging
-            if frame_count % 1000 == 0:
+            if frame_count % 1000 == 0 and total_frames > 0:
                 progress = (frame_count / total_frames) * 100
                 logger.info(f"Processed {frame_count}/{total_frames} frames ({progress:.1f}%)")
+    
+    def save_screenshots(self, video_path: str, output_dir: str, segments: List[ScreenSegment]):
+        """Write the full-resolution representative frame of each segment and set its screenshot_path"""
+        if not segments:
+            return
         
-        cap.release()
-        logger.info(f"Extracted {len(frames_info)} frames for analysis")
-        return frames_info
+        # A screen shown again later with pixel-identical content reuses the earlier file
+        written = {}
+        frames = self._frames_at(video_path, [segment.frame_number for segment in segments])
+        for segment, (frame_number, frame) in zip(segments, frames):
+            digest = hashlib.blake2b(frame, digest_size=16).digest()
+            frame_path = written.get(digest)
+            if frame_path is None:
+                frame_path = os.path.join(output_dir, f"frame_{frame_number:06d}.jpg")
+                cv2.imwrite(frame_path, frame)
+                written[digest] = frame_path
+            segment.screenshot_path = frame_path
+    
+    def _frames_at(self, video_path: str, frame_numbers: List[int]) -> Iterator[Tuple[int, np.ndarray]]:
+        """Decode the given ascending frame numbers, seeking while the container seeks accurately"""
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise ValueError(f"Could not open video file: {video_path}")
+        
+        i = 0
+        try:
+            try:
+                while i < len(frame_numbers):
+                    frame = _read_frame_at(cap, frame_numbers[i])
+                    if frame is None:
+                        break
+                    yield frame_numbers[i], frame
+                    i += 1
+            except _SeekUnreliable as e:
+                logger.info(f"{e}, reading screenshots sequentially")
+                cap.release()
+                cap = cv2.VideoCapture(video_path)
+                
+                frame_count = 0
+                while i < len(frame_numbers) and cap.grab():
+                    if frame_count == frame_numbers[i]:
+                        ret, frame = cap.retrieve()
+                        if not ret:
+                            break
+                        yield frame_count, frame
+                        i += 1
+                    frame_count += 1
+        finally:
+            cap.release()
+        
+        if i < len(frame_numbers):
+            raise ValueError(f"Could not read frame {frame_numbers[i]} of {video_path}")
     
     def calculate_frame_similarity(self, img1_path: str, img2_path: str) -> float:
         """Calculate structural similarity between two frames"""
         try:
-            # Load images in grayscale
-            img1 = cv2.imread(img1_path, cv2.IMREAD_GRAYSCALE)
-            img2 = cv2.imread(img2_path, cv2.IMREAD_GRAYSCALE)
+            # Load images in grayscale at the comparison size
+            img1 = _load_gray(img1_path)
+            img2 = _load_gray(img2_path)
             
             if img1 is None or img2 is None:
                 return 0.0
             
-            # Resize to standard size for comparison
-            height, width = 480, 640
-            img1 = cv2.resize(img1, (width, height))
-            img2 = cv2.resize(img2, (width, height))
-            
             # Calculate SSIM
-            similarity = ssim(img1, img2)
-            return similarity
-            
+            kernel = _make_ssim_kernel()
+            kernel.push(img1)
+            kernel.push(img2)
+            return kernel.similarity()
+        
         except Exception as e:
             logger.error(f"Error calculating similarity: {e}")
             return 0.0
@@ -106,58 +444,80 @@ class VideoAnalyzer:
             if img1 is None or img2 is None:
                 return 0.0
             
-            # Resize to standard size for comparison
-            height, width = 480, 640
-            img1 = cv2.resize(img1, (width, height))
-            img2 = cv2.resize(img2, (width, height))
-            
-            # Calculate histograms for each color channel
-            hist1_b = cv2.calcHist([img1], [0], None, [256], [0, 256])
-            hist1_g = cv2.calcHist([img1], [1], None, [256], [0, 256])
-            hist1_r = cv2.calcHist([img1], [2], None, [256], [0, 256])
-            
-            hist2_b = cv2.calcHist([img2], [0], None, [256], [0, 256])
-            hist2_g = cv2.calcHist([img2], [1], None, [256], [0, 256])
-            hist2_r = cv2.calcHist([img2], [2], None, [256], [0, 256])
-            
-            # Calculate correlation for each channel
-            corr_b = cv2.compareHist(hist1_b, hist2_b, cv2.HISTCMP_CORREL)
-            corr_g = cv2.compareHist(hist1_g, hist2_g, cv2.HISTCMP_CORREL)
-            corr_r = cv2.compareHist(hist1_r, hist2_r, cv2.HISTCMP_CORREL)
-            
-            # Average correlation (higher = more similar)
-            avg_correlation = (corr_b + corr_g + corr_r) / 3.0
+            # Correlation of the joint colour histograms (higher = more similar)
+            correlation = cv2.compareHist(_color_histogram(img1), _color_histogram(img2), cv2.HISTCMP_CORREL)
             
             # Convert to difference (lower = more similar)
-            difference = 1.0 - avg_correlation
+            difference = 1.0 - correlation
             return difference
             
         except Exception as e:
             logger.error(f"Error calculating histogram difference: {e}")
             return 0.0
     
-    def detect_screen_changes(self, frames_info: List[Tuple[int, float, str]]) -> List[ScreenSegment]:
-        """Detect significant screen changes like reference code"""
-        if len(frames_info) < 2:
-            return []
+    def _adjacent_similarities(self, frames: Iterable[Tuple[int, float, np.ndarray]]
+                               ) -> Iterator[Tuple[int, float, Optional[float]]]:
+        """(frame number, timestamp, similarity to the previous sample) per frame as it arrives; None for the first"""
+        if not self.use_ssim:
+            # Hamming distance between dHashes, scaled so 1.0 means identical like SSIM
+            prev_hash = None
+            for frame_num, timestamp, frame in frames:
+                frame_hash = _dhash(frame)
+                similarity = None
+                if prev_hash is not None:
+                    similarity = 1.0 - bin(prev_hash ^ frame_hash).count('1') / _DHASH_BITS
+                prev_hash = frame_hash
+                yield frame_num, timestamp, similarity
+            return
+        
+        # Optional cheap cascade: near-identical histograms count as the same screen without running SSIM
+        skip_threshold = self.histogram_skip_threshold
         
+        # Buffers are allocated once per video; moments are computed lazily and reused for the following pair
+        kernel = _make_ssim_kernel()
+        prev_frame = prev_hist = hist = None
+        prev_pushed = False
+        for frame_num, timestamp, frame in frames:
+            if skip_threshold is not None:
+                hist = cv2.calcHist([frame], [0], None, [_GRAY_HIST_BINS], [0, 256])
+            
+            similarity = None
+            pushed = False
+            if prev_frame is not None:
+                if skip_threshold is not None and cv2.compareHist(prev_hist, hist, cv2.HISTCMP_CORREL) > skip_threshold:
+                    similarity = 1.0
+                else:
+                    if not prev_pushed:
+                        kernel.push(prev_frame)
+                    kernel.push(frame)
+                    pushed = True
+                    similarity = kernel.similarity()
+            
+            prev_frame, prev_hist, prev_pushed = frame, hist, pushed
+            yield frame_num, timestamp, similarity
+    
+    def detect_screen_changes(self, frames: Iterable[Tuple[int, float, np.ndarray]]) -> List[ScreenSegment]:
+        """Detect significant screen changes like reference code; screenshot paths are filled in later"""
         segments = []
+        samples = []  # (frame number, timestamp) of each sampled frame; the images are not kept
         current_segment_start = 0
         segment_id = 1
         
         logger.info("🔍 Starting screen change detection...")
         
-        for i in range(1, len(frames_info)):
-            frame_num, timestamp, frame_path = frames_info[i]
-            prev_frame_path = frames_info[i-1][2]
-            
-            # Calculate similarity with previous frame
-            similarity = self.calculate_frame_similarity(prev_frame_path, frame_path)
+        # Hash similarities are not on the SSIM scale, so hash mode has its own cut-off
+        if self.use_ssim:
+            change_threshold = self.similarity_threshold
+        else:
+            change_threshold = 1.0 - self.hash_max_distance / _DHASH_BITS
+        
+        for frame_num, timestamp, similarity in self._adjacent_similarities(frames):
+            samples.append((frame_num, timestamp))
             
             # If similarity is below threshold, we have a screen change
-            if similarity < self.similarity_threshold:
+            if similarity is not None and similarity < change_threshold:
                 # Create segment for previous screen
-                prev_timestamp = frames_info[current_segment_start][1]
+                prev_timestamp = samples[current_segment_start][1]
                 duration = timestamp - prev_timestamp
                 
                 # Only create segment if it meets minimum duration
@@ -166,30 +526,30 @@ class VideoAnalyzer:
                         id=segment_id,
                         start_time=prev_timestamp,
                         end_time=timestamp,
-                        screenshot_path=frames_info[current_segment_start][2],
-                        frame_number=frames_info[current_segment_start][0],
+                        screenshot_path="",
+                        frame_number=samples[current_segment_start][0],
                         similarity_score=(1.0 - similarity) * 100,  # Convert to percentage
                         description=f"Screen {segment_id}"
                     )
                     segments.append(segment)
                     segment_id += 1
                     
-                    logger.info(f"📸 Screen {segment_id-1}: Change detected at {timestamp:.1f}s (SSIM: {similarity:.3f})")
+                    logger.info(f"📸 Screen {segment_id-1}: Change detected at {timestamp:.1f}s (similarity: {similarity:.3f})")
                 
-                current_segment_start = i
+                current_segment_start = len(samples) - 1
         
         # Add final segment
-        if current_segment_start < len(frames_info) - 1:
-            final_timestamp = frames_info[-1][1]
-            duration = final_timestamp - frames_info[current_segment_start][1]
+        if current_segment_start < len(samples) - 1:
+            final_timestamp = samples[-1][1]
+            duration = final_timestamp - samples[current_segment_start][1]
             
             if duration >= self.min_duration:
                 segment = ScreenSegment(
                     id=segment_id,
-                    start_time=frames_info[current_segment_start][1],
+                    start_time=samples[current_segment_start][1],
                     end_time=final_timestamp,
-                    screenshot_path=frames_info[current_segment_start][2],
-                    frame_number=frames_info[current_segment_start][0],
+                    screenshot_path="",
+                    frame_number=samples[current_segment_start][0],
                     similarity_score=80.0,
                     description=f"Screen {segment_id}"
                 )
@@ -203,11 +563,11 @@ class VideoAnalyzer:
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
         
-        # Extract frames
-        frames_info = self.extract_frames(video_path, output_dir)
+        # Sample frames and detect screen changes in one pass; frames are compared as they are decoded
+        segments = self.detect_screen_changes(self.extract_frames(video_path))
         
-        # Detect screen changes
-        segments = self.detect_screen_changes(frames_info)
+        # Persist only the representative frame of each segment
+        self.save_screenshots(video_path, output_dir, segments)
         
         return segments
     
@@ -1,15 +1,49 @@
 import os
+import sys
 import subprocess
 import tempfile
+import threading
 import logging
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from pathlib import Path
 import json
+from .transcript_index import TranscriptLookupMixin
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Slotted dataclasses need Python 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Use base model for good balance of speed and accuracy
+_WHISPER_MODEL = "base"
+
+@lru_cache(maxsize=None)
+def _load_model(backend: str):
+    """Load the Whisper model once per process for the given backend"""
+    if backend == "faster-whisper":
+        import ctranslate2
+        from faster_whisper import WhisperModel
+        
+        logger.info("Loading Whisper model (faster-whisper)...")
+        # float16 on GPU, int8 on CPU
+        if ctranslate2.get_cuda_device_count() > 0:
+            model = WhisperModel(_WHISPER_MODEL, device="cuda", compute_type="float16")
+            try:
+                from faster_whisper import BatchedInferencePipeline
+            except ImportError:  # faster-whisper < 1.1
+                return model
+            # Splits the audio at VAD silences and decodes the pieces as one GPU batch
+            return BatchedInferencePipeline(model=model)
+        return WhisperModel(_WHISPER_MODEL, device="cpu", compute_type="int8")
+    
+    import whisper
+    
+    logger.info("Loading Whisper model (openai-whisper)...")
+    return whisper.load_model(_WHISPER_MODEL)
+
+@dataclass(**_DATACLASS_OPTIONS)
 class TranscriptSegment:
     """Represents a transcribed speech segment"""
     start_time: float
@@ -22,23 +56,47 @@ class TranscriptSegment:
     def duration(self) -> float:
         return self.end_time - self.start_time
 
-class WhisperSpeechProcessor:
+class WhisperSpeechProcessor(TranscriptLookupMixin):
     """Speech processor using OpenAI Whisper for offline speech recognition"""
     
     def __init__(self):
         self.chunk_duration = 30
+        self._model = None
+        self._model_lock = threading.Lock()
+        self.whisper_backend = None
         self.whisper_available = self.check_whisper()
-        logger.info(f"Initialized Whisper Speech Processor (Available: {self.whisper_available})")
+        logger.info(f"Initialized Whisper Speech Processor (Available: {self.whisper_available}, backend: {self.whisper_backend})")
         
     def check_whisper(self) -> bool:
-        """Check if Whisper is available"""
+        """Check if Whisper is available, preferring faster-whisper over openai-whisper"""
+        try:
+            import faster_whisper
+            self.whisper_backend = "faster-whisper"
+            return True
+        except ImportError:
+            pass
+        
         try:
             import whisper
+            self.whisper_backend = "openai-whisper"
             return True
         except ImportError:
-            logger.warning("Whisper not installed. Install with: pip install openai-whisper")
+            logger.warning("Whisper not installed. Install with: pip install faster-whisper (or openai-whisper)")
             return False
     
+    def _get_model(self):
+        """Whisper model for the detected backend, loaded on first use"""
+        with self._model_lock:
+            if self._model is None:
+                self._model = _load_model(self.whisper_backend)
+            return self._model
+    
+    def close(self):
+        """Release the cached Whisper model"""
+        with self._model_lock:
+            self._model = None
+            _load_model.cache_clear()
+    
     def check_ffmpeg(self) -> bool:
         """Check if FFmpeg is available"""
         try:
@@ -87,28 +145,11 @@ class WhisperSpeechProcessor:
             if not self.whisper_available:
                 return []
             
-            import whisper
-            
-            logger.info("Loading Whisper model...")
-            # Use base model for good balance of speed and accuracy
-            model = whisper.load_model("base")
-            
             logger.info(f"Transcribing audio: {audio_path}")
-            result = model.transcribe(
-                audio_path,
-                word_timestamps=True,
-                verbose=False
-            )
-            
-            segments = []
-            if 'segments' in result:
-                for segment in result['segments']:
-                    segments.append({
-                        'start': segment.get('start', 0.0),
-                        'end': segment.get('end', 0.0),
-                        'text': segment.get('text', '').strip(),
-                        'confidence': segment.get('avg_logprob', 0.0)
-                    })
+            if self.whisper_backend == "faster-whisper":
+                segments = self._transcribe_faster_whisper(audio_path)
+            else:
+                segments = self._transcribe_openai_whisper(audio_path)
             
             logger.info(f"Whisper transcription complete: {len(segments)} segments")
             return segments
@@ -117,6 +158,39 @@ class WhisperSpeechProcessor:
             logger.error(f"Error with Whisper transcription: {e}")
             return []
     
+    def _transcribe_faster_whisper(self, audio_path: str) -> List[Dict[str, Any]]:
+        """Transcribe with faster-whisper (CTranslate2)"""
+        # Segments are generated lazily as decoding proceeds
+        segments_iter, _ = self._get_model().transcribe(audio_path)
+        return [
+            {
+                'start': segment.start,
+                'end': segment.end,
+                'text': segment.text.strip(),
+                'confidence': segment.avg_logprob
+            }
+            for segment in segments_iter
+        ]
+    
+    def _transcribe_openai_whisper(self, audio_path: str) -> List[Dict[str, Any]]:
+        """Transcribe with the reference openai-whisper implementation"""
+        result = self._get_model().transcribe(
+            audio_path,
+            word_timestamps=True,
+            verbose=False
+        )
+        
+        segments = []
+        if 'segments' in result:
+            for segment in result['segments']:
+                segments.append({
+                    'start': segment.get('start', 0.0),
+                    'end': segment.get('end', 0.0),
+                    'text': segment.get('text', '').strip(),
+                    'confidence': segment.get('avg_logprob', 0.0)
+                })
+        return segments
+    
     def transcribe_with_speech_recognition(self, audio_path: str) -> List[Dict[str, Any]]:
         """Fallback transcription using speech_recognition library"""
         try:
@@ -204,33 +278,18 @@ class WhisperSpeechProcessor:
             logger.error(f"Error processing video audio: {e}")
             return []
     
-    def get_transcript_for_timerange(self, transcript_segments: List[TranscriptSegment], 
-                                   start_time: float, end_time: float) -> str:
-        """Get transcript text for a specific time range"""
-        relevant_segments = []
-        
-        for segment in transcript_segments:
-            # Check if segment overlaps with the time range
-            if (segment.start_time < end_time and segment.end_time > start_time):
-                relevant_segments.append(segment)
-        
-        # Sort by start time
-        relevant_segments.sort(key=lambda x: x.start_time)
-        
-        # Combine text
-        transcript_text = " ".join([seg.text for seg in relevant_segments])
-        return transcript_text.strip()
-    
     def analyze_speech_patterns(self, transcript_segments: List[TranscriptSegment]) -> Dict[str, Any]:
         """Analyze speech patterns for insights"""
         if not transcript_segments:
             return {}
         
-        total_duration = max(seg.end_time for seg in transcript_segments) if transcript_segments else 0
-        total_speech_time = sum(seg.duration for seg in transcript_segments)
+        # Shares the column arrays built for time-range lookups
+        index = self._index_for(transcript_segments)
+        segments = index.array
+        _, total_speech_time, total_duration, _, _, _ = segments.reduce()
         
         # Calculate speaking rate (words per minute)
-        total_words = sum(len(seg.text.split()) for seg in transcript_segments)
+        total_words = int(index.word_counts.sum())
         speaking_rate = (total_words / (total_speech_time / 60)) if total_speech_time > 0 else 0
         
         return {
@@ -22,6 +22,9 @@ from utils import FileManager, TimeUtils
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Confidence bars for 0-10 filled cells, built once instead of per segment
+CONFIDENCE_BARS = ["█" * filled + "░" * (10 - filled) for filled in range(11)]
+
 def demo_analysis(video_path: str):
     """Run a complete analysis demo"""
     
@@ -77,11 +80,8 @@ def demo_analysis(video_path: str):
         
         # Export JSON
         json_path = output_dir / "timeline_analysis.json"
-        timeline_data = content_correlator.export_timeline_data(timeline_segments)
-        
-        import json
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(timeline_data, f, indent=2, ensure_ascii=False)
+        with open(json_path, 'wb') as f:
+            f.write(content_correlator.export_timeline_bytes(timeline_segments, indent=True))
         
         logger.info(f"✅ JSON report saved: {json_path}")
         
@@ -106,7 +106,7 @@ def demo_analysis(video_path: str):
         # Show timeline overview
         logger.info("\n📋 TIMELINE OVERVIEW:")
         for segment in timeline_segments:
-            confidence_bar = "█" * int(segment.confidence_score * 10) + "░" * (10 - int(segment.confidence_score * 10))
+            confidence_bar = CONFIDENCE_BARS[max(0, min(10, int(segment.confidence_score * 10)))]
             logger.info(f"   {segment.formatted_time_range} | {confidence_bar} | {segment.screen_description}")
             if segment.key_topics:
                 logger.info(f"      Topics: {', '.join(segment.key_topics)}")
@@ -1,33 +1,85 @@
 import os
 import json
+import asyncio
+import shutil
+import secrets
 import tempfile
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import List, Optional
 from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import our core modules
 from core.video_analyzer import VideoAnalyzer
 from core.speech_processor import SpeechProcessor
 from core.whisper_speech_processor import WhisperSpeechProcessor
 from core.simple_audio_processor import SimpleAudioProcessor
-from core.content_correlator import ContentCorrelator
+from core.content_correlator import ContentCorrelator, TimelineSegment
 from core.pdf_exporter import PDFExporter
+from core.segment_array import SegmentArray
+from utils.session_store import SessionStore
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Uploads are copied to disk in pieces of this size
+_UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+# Per-segment fields gathered into columns for the results JSON
+_TIMELINE_JSON_FIELDS = (
+    'id', 'formatted_time_range', 'screenshot_path', 'transcript', 'summary', 'key_topics', 'screen_description'
+)
+
+# PDF rendering gets its own threads so it cannot starve video processing
+_pdf_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pdf-export")
+
+# Frame analysis is CPU-bound and runs in worker processes; transcription mostly waits on the API.
+# The cores are shared between the uvicorn workers (WEB_CONCURRENCY), each running its own pools
+_WEB_WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+_CPU_WORKERS = max(1, (os.cpu_count() or 1) // _WEB_WORKERS)
+
+# Created in lifespan, inside each server process: an asyncio.Semaphore made at import
+# time binds to the wrong event loop on Python 3.8/3.9
+_analysis_pool: Optional[ProcessPoolExecutor] = None
+_speech_pool: Optional[ThreadPoolExecutor] = None
+_processing_slots: Optional[asyncio.Semaphore] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create this server process's processing pools on startup and shut them down on exit"""
+    global _analysis_pool, _speech_pool, _processing_slots
+    _analysis_pool = ProcessPoolExecutor(max_workers=_CPU_WORKERS)
+    # Speech jobs never outnumber the processing slots
+    _speech_pool = ThreadPoolExecutor(max_workers=_CPU_WORKERS, thread_name_prefix="speech")
+    # Caps how many uploads are processed at once; the rest wait their turn
+    _processing_slots = asyncio.Semaphore(_CPU_WORKERS)
+    try:
+        yield
+    finally:
+        _analysis_pool.shutdown(wait=False)
+        _speech_pool.shutdown(wait=False)
+
 # Create FastAPI app
 app = FastAPI(
     title="Video Timeline Analyzer",
     description="Intelligent video analysis system that detects screen changes and correlates them with speech",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson serializes the nested timeline several times faster than the stdlib encoder
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware for React frontend
@@ -43,9 +95,8 @@ app.add_middleware(
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 app.mount("/exports", StaticFiles(directory="exports"), name="exports")
 
-# Global variables to store analysis results
-analysis_results = {}
-processing_status = {}
+# Session status and analysis results; shared through Redis when REDIS_URL is set
+session_store = SessionStore()
 
 # Initialize processors with real video processing approach
 video_analyzer = VideoAnalyzer(
@@ -84,67 +135,114 @@ content_correlator = ContentCorrelator()
 pdf_exporter = PDFExporter()
 
 
+def _save_upload(source, video_path: Path) -> None:
+    """Copy an upload's spool file to disk without holding the whole video in memory"""
+    source.seek(0)
+    with open(video_path, "wb") as buffer:
+        shutil.copyfileobj(source, buffer, _UPLOAD_CHUNK_BYTES)
+
+def _timeline_json(session_id: str, timeline_segments: List[TimelineSegment]) -> List[dict]:
+    """JSON-serializable view of the timeline as returned by /results"""
+    # Gathered one column at a time; screenshot URLs are resolved here once per session
+    segments = SegmentArray.from_list(timeline_segments, 'confidence_score', _TIMELINE_JSON_FIELDS)
+    columns = segments.columns
+    screenshot_urls = [
+        f"/uploads/{session_id}/frames/{os.path.basename(path)}" for path in columns["screenshot_path"]
+    ]
+    return [
+        {
+            "id": segment_id,
+            "start_time": start_time,
+            "end_time": end_time,
+            "duration": duration,
+            "formatted_time_range": time_range,
+            "screenshot_path": screenshot_url,
+            "transcript": transcript,
+            "summary": summary,
+            "key_topics": key_topics,
+            "screen_description": screen_description,
+            "confidence_score": confidence_score
+        }
+        for (segment_id, start_time, end_time, duration, time_range, screenshot_url,
+             transcript, summary, key_topics, screen_description, confidence_score) in zip(
+            columns["id"], segments.starts.tolist(), segments.ends.tolist(), segments.durations.tolist(),
+            columns["formatted_time_range"], screenshot_urls, columns["transcript"], columns["summary"],
+            columns["key_topics"], columns["screen_description"], segments.confidences.tolist()
+        )
+    ]
+
 @app.post("/upload")
 async def upload_video(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
     """Upload and process video file"""
     if not file.filename.lower().endswith(('.mp4', '.avi', '.mov', '.mkv')):
         raise HTTPException(status_code=400, detail="Unsupported video format")
     
-    # Create unique session ID
-    session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # Create unique session ID; random so same-second uploads cannot collide or be guessed
+    session_id = secrets.token_urlsafe(8)
     
     # Save uploaded file
     upload_dir = Path("uploads") / session_id
     upload_dir.mkdir(parents=True, exist_ok=True)
     
     video_path = upload_dir / file.filename
-    with open(video_path, "wb") as buffer:
-        content = await file.read()
-        buffer.write(content)
+    # Copy the spooled upload in a single worker thread rather than hopping threads for every chunk
+    await asyncio.get_running_loop().run_in_executor(None, _save_upload, file.file, video_path)
     
     # Initialize processing status
-    processing_status[session_id] = {
+    await session_store.set_status(session_id, {
         "status": "uploaded",
         "progress": 0,
         "message": "Video uploaded successfully",
-        "video_filename": file.filename
-    }
+        "video_filename": file.filename,
+        "created_at": datetime.now().isoformat()
+    })
     
     # Start background processing
-    background_tasks.add_task(process_video, session_id, str(video_path))
+    background_tasks.add_task(process_video_when_free, session_id, str(video_path))
     
     return {"session_id": session_id, "message": "Video uploaded. Processing started."}
 
+async def process_video_when_free(session_id: str, video_path: str):
+    """Run process_video once one of the bounded processing slots is free"""
+    async with _processing_slots:
+        await process_video(session_id, video_path)
+
 async def process_video(session_id: str, video_path: str):
     """Background task to process video"""
     try:
         logger.info(f"Starting video processing for session {session_id}")
         
         # Update status
-        processing_status[session_id].update({
+        await session_store.update_status(session_id, {
             "status": "processing",
             "progress": 10,
-            "message": "Analyzing video frames..."
+            "message": "Analyzing video frames and audio..."
         })
         
         # Create output directories
         frames_dir = Path("uploads") / session_id / "frames"
         frames_dir.mkdir(exist_ok=True)
         
-        # Step 1: Analyze video for screen changes
-        logger.info("Step 1: Analyzing screen changes")
-        screen_segments = video_analyzer.analyze_video(video_path, str(frames_dir))
+        # Steps 1 and 2 are independent (frames vs audio), so run them side by side off the event loop
+        logger.info("Steps 1-2: Analyzing screen changes and processing speech")
+        loop = asyncio.get_running_loop()
+        screen_task = loop.run_in_executor(_analysis_pool, video_analyzer.analyze_video, video_path, str(frames_dir))
+        speech_task = loop.run_in_executor(_speech_pool, speech_processor.process_video_audio, video_path)
         
-        processing_status[session_id].update({
+        # Report whichever stage finishes first while the other keeps running
+        done, _ = await asyncio.wait({screen_task, speech_task}, return_when=asyncio.FIRST_COMPLETED)
+        if screen_task in done and not screen_task.exception():
+            message = f"Found {len(screen_task.result())} screen segments. Processing audio..."
+        else:
+            message = "Audio processed. Analyzing video frames..."
+        await session_store.update_status(session_id, {
             "progress": 40,
-            "message": f"Found {len(screen_segments)} screen segments. Processing audio..."
+            "message": message
         })
         
-        # Step 2: Process speech
-        logger.info("Step 2: Processing speech")
-        transcript_segments = speech_processor.process_video_audio(video_path)
+        screen_segments, transcript_segments = await asyncio.gather(screen_task, speech_task)
         
-        processing_status[session_id].update({
+        await session_store.update_status(session_id, {
             "progress": 70,
             "message": "Correlating content..."
         })
@@ -153,22 +251,23 @@ async def process_video(session_id: str, video_path: str):
         logger.info("Step 3: Correlating content")
         timeline_segments = content_correlator.correlate_content(screen_segments, transcript_segments)
         
-        processing_status[session_id].update({
+        await session_store.update_status(session_id, {
             "progress": 90,
             "message": "Finalizing analysis..."
         })
         
         # Store results
-        analysis_results[session_id] = {
+        await session_store.set_results(session_id, {
             "timeline_segments": timeline_segments,
             "screen_segments": screen_segments,
+            "timeline_data": _timeline_json(session_id, timeline_segments),
             "transcript_segments": transcript_segments,
             "video_path": video_path,
             "processed_at": datetime.now().isoformat()
-        }
+        })
         
         # Update final status
-        processing_status[session_id].update({
+        await session_store.update_status(session_id, {
             "status": "completed",
             "progress": 100,
             "message": f"Analysis complete! Found {len(timeline_segments)} timeline segments."
@@ -178,7 +277,7 @@ async def process_video(session_id: str, video_path: str):
         
     except Exception as e:
         logger.error(f"Error processing video for session {session_id}: {e}")
-        processing_status[session_id].update({
+        await session_store.update_status(session_id, {
             "status": "error",
             "progress": 0,
             "message": f"Error: {str(e)}"
@@ -187,43 +286,28 @@ async def process_video(session_id: str, video_path: str):
 @app.get("/status/{session_id}")
 async def get_processing_status(session_id: str):
     """Get processing status for a session"""
-    if session_id not in processing_status:
+    status = await session_store.get_status(session_id)
+    if status is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    return processing_status[session_id]
+    return status
 
 @app.get("/results/{session_id}")
 async def get_results(session_id: str):
     """Get analysis results for a session"""
-    if session_id not in analysis_results:
+    results = await session_store.get_results(session_id)
+    if results is None:
         raise HTTPException(status_code=404, detail="Results not found")
     
-    results = analysis_results[session_id]
-    
-    # Convert timeline segments to JSON-serializable format
-    timeline_data = []
-    for segment in results["timeline_segments"]:
-        segment_data = {
-            "id": segment.id,
-            "start_time": segment.start_time,
-            "end_time": segment.end_time,
-            "duration": segment.duration,
-            "formatted_time_range": segment.formatted_time_range,
-            "screenshot_path": f"/uploads/{session_id}/frames/{os.path.basename(segment.screenshot_path)}",
-            "transcript": segment.transcript,
-            "summary": segment.summary,
-            "key_topics": segment.key_topics,
-            "screen_description": segment.screen_description,
-            "confidence_score": segment.confidence_score
-        }
-        timeline_data.append(segment_data)
+    # The JSON view is built once when processing finishes
+    timeline_data = results["timeline_data"]
     
     return {
         "session_id": session_id,
         "timeline_segments": timeline_data,
         "metadata": {
             "total_segments": len(timeline_data),
-            "video_filename": processing_status.get(session_id, {}).get("video_filename", "Unknown"),
+            "video_filename": (await session_store.get_status(session_id) or {}).get("video_filename", "Unknown"),
             "processed_at": results["processed_at"]
         }
     }
@@ -232,13 +316,13 @@ async def get_results(session_id: str):
 @app.post("/export/pdf/{session_id}")
 async def export_pdf(session_id: str):
     """Export timeline to PDF"""
-    if session_id not in analysis_results:
+    results = await session_store.get_results(session_id)
+    if results is None:
         raise HTTPException(status_code=404, detail="Results not found")
     
     try:
-        results = analysis_results[session_id]
         timeline_segments = results["timeline_segments"]
-        video_filename = processing_status.get(session_id, {}).get("video_filename", "Unknown")
+        video_filename = (await session_store.get_status(session_id) or {}).get("video_filename", "Unknown")
         
         # Create exports directory
         exports_dir = Path("exports")
@@ -248,27 +332,12 @@ async def export_pdf(session_id: str):
         pdf_filename = f"timeline_analysis_{session_id}.pdf"
         pdf_path = exports_dir / pdf_filename
         
-        # Convert dict segments back to TimelineSegment objects for PDF export
-        from core.content_correlator import TimelineSegment
-        
-        timeline_objects = []
-        for seg_dict in timeline_segments:
-            timeline_obj = TimelineSegment(
-                id=seg_dict.get('id', 0),
-                start_time=seg_dict.get('start_time', 0.0),
-                end_time=seg_dict.get('end_time', 0.0),
-                screenshot_path=seg_dict.get('screenshot_path', ''),
-                transcript=seg_dict.get('transcript', ''),
-                summary=seg_dict.get('summary', ''),
-                key_topics=seg_dict.get('key_topics', []),
-                screen_description=seg_dict.get('screen_description', ''),
-                confidence_score=seg_dict.get('confidence_score', 0.0)
-            )
-            timeline_objects.append(timeline_obj)
-        
         # Export PDF with detailed logging
-        logger.info(f"Exporting PDF for session {session_id} with {len(timeline_objects)} segments")
-        pdf_result = pdf_exporter.export_timeline_pdf(timeline_objects, str(pdf_path), video_filename)
+        logger.info(f"Exporting PDF for session {session_id} with {len(timeline_segments)} segments")
+        loop = asyncio.get_running_loop()
+        pdf_result = await loop.run_in_executor(
+            _pdf_pool, pdf_exporter.export_timeline_pdf, timeline_segments, str(pdf_path), video_filename
+        )
         
         # Verify PDF was created
         if not pdf_path.exists():
@@ -306,17 +375,13 @@ async def download_file(session_id: str, filename: str):
 async def cleanup_session(session_id: str):
     """Clean up session data"""
     try:
-        # Remove from memory
-        if session_id in analysis_results:
-            del analysis_results[session_id]
-        if session_id in processing_status:
-            del processing_status[session_id]
+        # Remove from the session store
+        await session_store.delete(session_id)
         
         # Clean up files (optional - you might want to keep them)
         session_dir = Path("uploads") / session_id
         if session_dir.exists():
-            import shutil
-            shutil.rmtree(session_dir)
+            await asyncio.get_running_loop().run_in_executor(None, shutil.rmtree, session_dir)
         
         return {"message": "Session cleaned up successfully"}
         
@@ -360,7 +425,7 @@ async def health_check():
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "active_sessions": len(processing_status),
+        "active_sessions": await session_store.count(),
         "analyzer_settings": {
             "similarity_threshold": video_analyzer.similarity_threshold,
             "min_duration": video_analyzer.min_duration,
@@ -373,11 +438,24 @@ if __name__ == "__main__":
     for directory in ["uploads", "exports"]:
         Path(directory).mkdir(exist_ok=True)
     
-    # Run the application
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
+    # Run the application; workers can only share sessions through Redis, and
+    # uvicorn picks uvloop/httptools automatically when they are installed
+    if session_store.shared or os.getenv("ENV") == "prod":
+        web_workers = (os.cpu_count() or 1) if session_store.shared else 1
+        # Inherited by the worker processes so each sizes its pools to its share of the cores
+        os.environ["WEB_CONCURRENCY"] = str(web_workers)
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=web_workers,
+            log_level="info"
+        )
+    else:
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+            log_level="info"
+        )
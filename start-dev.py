@@ -8,18 +8,30 @@ import os
 import sys
 import subprocess
 import threading
-import time
 from pathlib import Path
 
+# Uvicorn logs this line once the app is ready to serve requests
+BACKEND_READY_LINE = "Application startup complete"
+BACKEND_READY_TIMEOUT = 30
+
 def start_backend():
     """Start the FastAPI backend server"""
     print("🚀 Starting FastAPI backend server...")
+    return subprocess.Popen([
+        sys.executable, "main.py"
+    ], cwd=Path(__file__).parent, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+def relay_backend_output(process, ready):
+    """Echo backend logs and set ready once it reports startup (or exits)"""
     try:
-        subprocess.run([
-            sys.executable, "main.py"
-        ], cwd=Path(__file__).parent)
-    except KeyboardInterrupt:
+        for line in process.stdout:
+            sys.stdout.write(line)
+            if BACKEND_READY_LINE in line:
+                ready.set()
+        process.wait()
         print("\n🛑 Backend server stopped")
+    finally:
+        ready.set()
 
 def start_frontend():
     """Start the React frontend development server"""
@@ -59,12 +71,20 @@ def main():
     for directory in ["uploads", "exports"]:
         Path(directory).mkdir(exist_ok=True)
     
-    # Start backend in a separate thread
-    backend_thread = threading.Thread(target=start_backend, daemon=True)
+    # Start backend and relay its output from a separate thread
+    backend = start_backend()
+    backend_ready = threading.Event()
+    backend_thread = threading.Thread(target=relay_backend_output, args=(backend, backend_ready), daemon=True)
     backend_thread.start()
     
-    # Give backend time to start
-    time.sleep(3)
+    # Start the frontend as soon as the backend reports it is up
+    if not backend_ready.wait(timeout=BACKEND_READY_TIMEOUT):
+        print(f"❌ Backend did not finish starting within {BACKEND_READY_TIMEOUT}s")
+        backend.terminate()
+        sys.exit(1)
+    if backend.poll() is not None:
+        print(f"❌ Backend exited during startup (exit code {backend.returncode})")
+        sys.exit(1)
     
     print("\n" + "=" * 50)
     print("🌐 Servers will be available at:")
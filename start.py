@@ -10,6 +10,9 @@ import os
 import sys
 import subprocess
 import logging
+import importlib.util
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Setup logging
@@ -19,6 +22,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# A successful FFmpeg probe is remembered for a day so startup skips the subprocess
+_FFMPEG_OK_MARKER = Path.home() / '.cache' / 'video-timeline' / 'ffmpeg.ok'
+_FFMPEG_OK_TTL = 24 * 60 * 60
+
 def check_python_version():
     """Check if Python version is compatible"""
     if sys.version_info < (3, 8):
@@ -28,26 +35,23 @@ def check_python_version():
 
 def check_dependencies():
     """Check if required dependencies are installed"""
+    # (import name, pip package) pairs
     required_packages = [
-        'opencv-python',
-        'numpy', 
-        'Pillow',
-        'scikit-image',
-        'groq',
-        'python-dotenv',
-        'fastapi',
-        'uvicorn',
-        'moviepy',
-        'librosa',
-        'reportlab'
+        ('cv2', 'opencv-python'),
+        ('numpy', 'numpy'),
+        ('PIL', 'Pillow'),
+        ('groq', 'groq'),
+        ('dotenv', 'python-dotenv'),
+        ('fastapi', 'fastapi'),
+        ('uvicorn', 'uvicorn'),
+        ('reportlab', 'reportlab')
     ]
     
     missing_packages = []
     
-    for package in required_packages:
-        try:
-            __import__(package.replace('-', '_'))
-        except ImportError:
+    # find_spec locates the package without running its (often slow) import-time code
+    for module, package in required_packages:
+        if importlib.util.find_spec(module) is None:
             missing_packages.append(package)
     
     if missing_packages:
@@ -80,9 +84,20 @@ def check_environment():
 
 def check_ffmpeg():
     """Check if FFmpeg is available"""
+    try:
+        if time.time() - _FFMPEG_OK_MARKER.stat().st_mtime < _FFMPEG_OK_TTL:
+            return True
+    except OSError:
+        pass
+    
     try:
         subprocess.run(['ffmpeg', '-version'], 
                       capture_output=True, check=True)
+        try:
+            _FFMPEG_OK_MARKER.parent.mkdir(parents=True, exist_ok=True)
+            _FFMPEG_OK_MARKER.touch()
+        except OSError:
+            pass
         return True
     except (subprocess.CalledProcessError, FileNotFoundError):
         logger.warning("FFmpeg not found. Some video processing features may not work.")
@@ -103,11 +118,12 @@ def start_application():
     
     try:
         import uvicorn
+        # uvloop and httptools are used automatically when installed; reload is for development only
         uvicorn.run(
             "main:app",
             host="0.0.0.0",
             port=8000,
-            reload=True,
+            reload=os.getenv("ENV") != "prod",
             log_level="info"
         )
     except KeyboardInterrupt:
@@ -129,14 +145,18 @@ def main():
     if not check_python_version():
         sys.exit(1)
     
-    if not check_dependencies():
-        sys.exit(1)
+    # The remaining checks are independent, so run them side by side
+    with ThreadPoolExecutor() as executor:
+        dependencies_ok = executor.submit(check_dependencies)
+        environment_ok = executor.submit(check_environment)
+        # Optional dependency; only warns
+        executor.submit(check_ffmpeg)
     
-    if not check_environment():
+    if not dependencies_ok.result():
         sys.exit(1)
     
-    # Check optional dependencies
-    check_ffmpeg()
+    if not environment_ok.result():
+        sys.exit(1)
     
     # Setup directories
     create_directories()
@@ -5,6 +5,7 @@ Simple test script to verify the setup is working correctly.
 
 import sys
 import os
+import importlib.util
 from pathlib import Path
 
 def test_python_version():
@@ -42,10 +43,10 @@ def test_dependencies():
     
     all_good = True
     for module, package in dependencies:
-        try:
-            __import__(module)
+        # Locate without importing; cv2, groq and fastapi are slow to initialise
+        if importlib.util.find_spec(module) is not None:
             print(f"✅ {package}")
-        except ImportError:
+        else:
             print(f"❌ {package} - run: pip install {package}")
             all_good = False
     
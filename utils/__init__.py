@@ -4,12 +4,15 @@ Utility modules for the Video Timeline Analyzer.
 This package contains helper utilities:
 - FileManager: File operations and validation
 - TimeUtils: Time formatting and conversion utilities
+- SessionStore: Session status/results shared between server workers
 """
 
 from .file_utils import FileManager
 from .time_utils import TimeUtils
+from .session_store import SessionStore
 
 __all__ = [
     'FileManager',
-    'TimeUtils'
+    'TimeUtils',
+    'SessionStore'
 ]
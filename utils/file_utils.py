@@ -1,57 +1,142 @@
 import os
+import asyncio
 import shutil
 import tempfile
+import threading
 from pathlib import Path
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Characters not allowed in filenames, all mapped to '_' in one translate pass
+_INVALID_FILENAME_CHARS = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
+
+# Copy chunk for files over 64 MiB, tunable with FILE_COPY_CHUNK_KB; smaller files use 64 KiB
+_COPY_CHUNK_BYTES = int(os.getenv('FILE_COPY_CHUNK_KB', '1024')) * 1024
+_LARGE_COPY_BYTES = 64 * 1024 * 1024
+_SMALL_COPY_CHUNK_BYTES = 64 * 1024
+
+# Largest upload validate_video_file accepts
+_MAX_VIDEO_SIZE = 500 * 1024 * 1024  # 500MB
+
+# Units for format_file_size, each 1024 times the previous
+_SIZE_NAMES = ("B", "KB", "MB", "GB", "TB")
+
+# Supported video container extensions
+_VIDEO_EXTENSIONS = frozenset({'.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv', '.webm'})
+
+# Directories ensure_directory has already created; a repeat call only needs to stat them
+_KNOWN_DIRS = set()
+_KNOWN_DIRS_LOCK = threading.Lock()
+
+def _copy_range_chunk(fsrc, fdst, offset: int, count: int) -> int:
+    """In-kernel copy; reflinks or server-side copies on filesystems that support it"""
+    return os.copy_file_range(fsrc.fileno(), fdst.fileno(), count, offset, offset)
+
+def _sendfile_chunk(fsrc, fdst, offset: int, count: int) -> int:
+    """In-kernel copy through the page cache"""
+    return os.sendfile(fdst.fileno(), fsrc.fileno(), offset, count)
+
+def _buffered_chunk(fsrc, fdst, offset: int, count: int) -> int:
+    """Plain read/write; works everywhere, follows the file positions"""
+    chunk = fsrc.read(count)
+    fdst.write(chunk)
+    return len(chunk)
+
+# Chunk copiers in order of preference, limited to what this platform's os module offers
+_CHUNK_COPIERS = [copier for name, copier in (('copy_file_range', _copy_range_chunk), ('sendfile', _sendfile_chunk))
+                  if hasattr(os, name)] + [_buffered_chunk]
+
+def _safe_stat(path: str) -> Optional[os.stat_result]:
+    """os.stat result, or None where os.path.exists would be False"""
+    try:
+        return os.stat(path)
+    except (OSError, ValueError):
+        return None
+
+def _size_checked(file_path: str, file_size: int) -> dict:
+    """validate_video_file result for an existing video file of the given size"""
+    if file_size > _MAX_VIDEO_SIZE:
+        return {
+            "valid": False, 
+            "error": f"File too large ({FileManager.format_file_size(file_size)}). Max size: {FileManager.format_file_size(_MAX_VIDEO_SIZE)}"
+        }
+    
+    if file_size == 0:
+        return {"valid": False, "error": "File is empty"}
+    
+    return {
+        "valid": True,
+        "size": file_size,
+        "formatted_size": FileManager.format_file_size(file_size),
+        "extension": FileManager.get_file_extension(file_path)
+    }
+
 class FileManager:
     """Utility class for file operations"""
     
     @staticmethod
     def ensure_directory(path: str) -> str:
         """Ensure directory exists, create if not"""
+        # Still checked on a hit, since anything (e.g. shutil.rmtree) may have removed it meanwhile
+        if path in _KNOWN_DIRS and os.path.isdir(path):
+            return path
+        
         Path(path).mkdir(parents=True, exist_ok=True)
+        with _KNOWN_DIRS_LOCK:
+            _KNOWN_DIRS.add(path)
         return path
     
+    @staticmethod
+    def forget_directory(path: str) -> None:
+        """Drop path and anything below it from the ensure_directory cache, e.g. after deleting it"""
+        root = os.path.normpath(path)
+        with _KNOWN_DIRS_LOCK:
+            stale = [known for known in _KNOWN_DIRS
+                     if os.path.normpath(known) == root or os.path.normpath(known).startswith(root + os.sep)]
+            _KNOWN_DIRS.difference_update(stale)
+    
     @staticmethod
     def clean_directory(path: str, keep_files: Optional[List[str]] = None) -> None:
         """Clean directory contents, optionally keeping specific files"""
         if not os.path.exists(path):
             return
         
-        keep_files = keep_files or []
+        keep_files = frozenset(keep_files or ())
         
-        for item in os.listdir(path):
-            if item in keep_files:
-                continue
+        # scandir entries carry the file type from the directory listing, so plain
+        # files and directories need no extra stat call (only symlinks are followed)
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name in keep_files:
+                    continue
                 
-            item_path = os.path.join(path, item)
-            try:
-                if os.path.isfile(item_path):
-                    os.unlink(item_path)
-                elif os.path.isdir(item_path):
-                    shutil.rmtree(item_path)
-            except Exception as e:
-                logger.warning(f"Could not remove {item_path}: {e}")
+                try:
+                    if entry.is_file():
+                        os.unlink(entry.path)
+                    elif entry.is_dir():
+                        shutil.rmtree(entry.path)
+                        FileManager.forget_directory(entry.path)
+                except Exception as e:
+                    logger.warning(f"Could not remove {entry.path}: {e}")
     
     @staticmethod
     def get_file_size(path: str) -> int:
         """Get file size in bytes"""
-        return os.path.getsize(path) if os.path.exists(path) else 0
+        st = _safe_stat(path)
+        return st.st_size if st is not None else 0
     
     @staticmethod
     def get_file_extension(filename: str) -> str:
         """Get file extension"""
-        return Path(filename).suffix.lower()
+        return os.path.splitext(filename)[1].lower()
     
     @staticmethod
     def is_video_file(filename: str) -> bool:
         """Check if file is a supported video format"""
-        video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv', '.webm'}
-        return FileManager.get_file_extension(filename) in video_extensions
+        return FileManager.get_file_extension(filename) in _VIDEO_EXTENSIONS
     
     @staticmethod
     def create_temp_file(suffix: str = '', prefix: str = 'tmp') -> str:
@@ -63,15 +148,8 @@ class FileManager:
     @staticmethod
     def safe_filename(filename: str) -> str:
         """Create safe filename by removing/replacing invalid characters"""
-        # Remove or replace invalid characters
-        invalid_chars = '<>:"/\\|?*'
-        safe_name = filename
-        
-        for char in invalid_chars:
-            safe_name = safe_name.replace(char, '_')
-        
-        # Remove leading/trailing spaces and dots
-        safe_name = safe_name.strip('. ')
+        # Replace invalid characters and remove leading/trailing spaces and dots
+        safe_name = filename.translate(_INVALID_FILENAME_CHARS).strip('. ')
         
         # Limit length
         if len(safe_name) > 255:
@@ -86,56 +164,103 @@ class FileManager:
         if size_bytes == 0:
             return "0 B"
         
-        size_names = ["B", "KB", "MB", "GB", "TB"]
-        i = 0
-        while size_bytes >= 1024 and i < len(size_names) - 1:
-            size_bytes /= 1024.0
-            i += 1
-        
-        return f"{size_bytes:.1f} {size_names[i]}"
+        # The unit is the number of whole 10-bit steps in the size, capped at TB
+        i = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_NAMES) - 1) if size_bytes > 0 else 0
+        return f"{size_bytes / (1 << (10 * i)):.1f} {_SIZE_NAMES[i]}"
     
     @staticmethod
-    def copy_file_with_progress(src: str, dst: str, chunk_size: int = 8192) -> None:
-        """Copy file with progress tracking"""
+    def copy_file_with_progress(src: str, dst: str, chunk_size: Optional[int] = None) -> None:
+        """Copy file with progress tracking; chunk_size defaults by file size (see _COPY_CHUNK_BYTES)"""
         total_size = os.path.getsize(src)
+        if chunk_size is None:
+            chunk_size = _COPY_CHUNK_BYTES if total_size > _LARGE_COPY_BYTES else _SMALL_COPY_CHUNK_BYTES
         copied = 0
+        last_percent = -1
         
         with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
-            while True:
-                chunk = fsrc.read(chunk_size)
-                if not chunk:
+            # Kernel-side copies first: copy_file_range, then sendfile, then buffered
+            copiers = iter(_CHUNK_COPIERS)
+            copy_chunk = next(copiers)
+            while copied < total_size:
+                try:
+                    sent = copy_chunk(fsrc, fdst, copied, min(chunk_size, total_size - copied))
+                except OSError:
+                    if copied or copy_chunk is _buffered_chunk:
+                        raise
+                    # e.g. EXDEV across filesystems, or macOS sendfile only sending to sockets
+                    copy_chunk = next(copiers)
+                    continue
+                if not sent:
                     break
-                fdst.write(chunk)
-                copied += len(chunk)
+                copied += sent
                 
-                # Could emit progress events here if needed
-                progress = (copied / total_size) * 100
-                logger.debug(f"Copy progress: {progress:.1f}%")
+                # Could emit progress events here if needed; logged once per whole percent
+                percent = copied * 100 // total_size
+                if percent != last_percent:
+                    last_percent = percent
+                    logger.debug(f"Copy progress: {percent}%")
+    
+    @staticmethod
+    def copy_many(pairs: List[Tuple[str, str]], max_workers: int = 4) -> None:
+        """Copy several (src, dst) files concurrently; sendfile releases the GIL while each copy runs"""
+        if len(pairs) <= 1:
+            for src, dst in pairs:
+                FileManager.copy_file_with_progress(src, dst)
+            return
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pairs))) as executor:
+            futures = [executor.submit(FileManager.copy_file_with_progress, src, dst) for src, dst in pairs]
+            for done, future in enumerate(as_completed(futures), start=1):
+                future.result()
+                logger.debug(f"Copied {done}/{len(pairs)} files")
+    
+    @staticmethod
+    async def aiocopy_file(src: str, dst: str, chunk_size: Optional[int] = None) -> None:
+        """Copy a file on a worker thread so the event loop keeps serving while the kernel copies"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, FileManager.copy_file_with_progress, src, dst, chunk_size)
+    
+    @staticmethod
+    async def copy_many_async(pairs: List[Tuple[str, str]], max_concurrency: int = 4) -> None:
+        """Copy several (src, dst) files with at most max_concurrency copies in flight"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def copy_one(src: str, dst: str) -> None:
+            async with semaphore:
+                await FileManager.aiocopy_file(src, dst)
+        
+        await asyncio.gather(*(copy_one(src, dst) for src, dst in pairs))
     
     @staticmethod
     def validate_video_file(file_path: str) -> dict:
         """Validate video file and return metadata"""
-        if not os.path.exists(file_path):
+        # One stat call answers both "exists" and "how big"
+        st = _safe_stat(file_path)
+        if st is None:
             return {"valid": False, "error": "File does not exist"}
         
         if not FileManager.is_video_file(file_path):
             return {"valid": False, "error": "Not a supported video format"}
         
-        file_size = FileManager.get_file_size(file_path)
-        max_size = 500 * 1024 * 1024  # 500MB
-        
-        if file_size > max_size:
-            return {
-                "valid": False, 
-                "error": f"File too large ({FileManager.format_file_size(file_size)}). Max size: {FileManager.format_file_size(max_size)}"
-            }
-        
-        if file_size == 0:
-            return {"valid": False, "error": "File is empty"}
+        return _size_checked(file_path, st.st_size)
+    
+    @staticmethod
+    def validate_video_dir(path: str) -> List[dict]:
+        """Validate every video file directly inside a directory in one scan"""
+        results = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if FileManager.get_file_extension(entry.name) not in _VIDEO_EXTENSIONS:
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    file_size = entry.stat().st_size
+                except OSError:
+                    continue
+                
+                result = _size_checked(entry.path, file_size)
+                result["path"] = entry.path
+                results.append(result)
         
-        return {
-            "valid": True,
-            "size": file_size,
-            "formatted_size": FileManager.format_file_size(file_size),
-            "extension": FileManager.get_file_extension(file_path)
-        }
+        return results
@@ -0,0 +1,90 @@
+import os
+import pickle
+import logging
+from typing import Any, Dict, Optional
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+# Keys are namespaced so status and results can be listed independently
+_STATUS_PREFIX = "status:"
+_RESULTS_PREFIX = "results:"
+
+class SessionStore:
+    """Per-session processing status and analysis results, kept in Redis when available so several workers can share them"""
+    
+    def __init__(self, redis_url: Optional[str] = None):
+        self.redis_url = redis_url or os.getenv('REDIS_URL')
+        self._redis = None
+        self._local: Dict[str, Any] = {}
+        
+        if self.redis_url and aioredis is not None:
+            self._redis = aioredis.Redis.from_url(self.redis_url)
+            logger.info(f"Session store backed by Redis at {self.redis_url}")
+        else:
+            if self.redis_url:
+                logger.warning("redis package not installed; keeping sessions in process memory")
+            logger.info("Session store backed by process memory (single worker only)")
+    
+    @property
+    def shared(self) -> bool:
+        """Whether sessions are visible to other server processes"""
+        return self._redis is not None
+    
+    async def _get(self, key: str) -> Optional[Any]:
+        if self._redis is None:
+            return self._local.get(key)
+        
+        data = await self._redis.get(key)
+        return pickle.loads(data) if data is not None else None
+    
+    async def _set(self, key: str, value: Any) -> None:
+        if self._redis is None:
+            self._local[key] = value
+        else:
+            await self._redis.set(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    
+    async def get_status(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Processing status for a session, or None if unknown"""
+        return await self._get(_STATUS_PREFIX + session_id)
+    
+    async def set_status(self, session_id: str, status: Dict[str, Any]) -> None:
+        """Replace the processing status for a session"""
+        await self._set(_STATUS_PREFIX + session_id, status)
+    
+    async def update_status(self, session_id: str, changes: Dict[str, Any]) -> None:
+        """Merge fields into the processing status; each session has a single writer"""
+        status = await self.get_status(session_id) or {}
+        status.update(changes)
+        await self.set_status(session_id, status)
+    
+    async def get_results(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Analysis results for a session, or None if not finished"""
+        return await self._get(_RESULTS_PREFIX + session_id)
+    
+    async def set_results(self, session_id: str, results: Dict[str, Any]) -> None:
+        """Store the analysis results for a session"""
+        await self._set(_RESULTS_PREFIX + session_id, results)
+    
+    async def delete(self, session_id: str) -> None:
+        """Forget both status and results for a session"""
+        keys = (_STATUS_PREFIX + session_id, _RESULTS_PREFIX + session_id)
+        if self._redis is None:
+            for key in keys:
+                self._local.pop(key, None)
+        else:
+            await self._redis.delete(*keys)
+    
+    async def count(self) -> int:
+        """Number of sessions with a recorded status"""
+        if self._redis is None:
+            return sum(1 for key in self._local if key.startswith(_STATUS_PREFIX))
+        
+        count = 0
+        async for _ in self._redis.scan_iter(match=_STATUS_PREFIX + "*"):
+            count += 1
+        return count
@@ -1,6 +1,78 @@
+import sys
+import math
 import time
+from functools import lru_cache
 from datetime import datetime, timedelta
 from typing import Union
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Below this many ranges the sort-and-scan loop is as fast as converting to NumPy
+_MERGE_VECTORIZE_MIN = 1024
+
+# create_time_ranges switches to np.linspace from this many segments
+_RANGES_VECTORIZE_MIN = 32
+
+# (seconds per unit, name) for time_ago below a day; a unit applies once strictly exceeded
+_TIME_AGO_UNITS = ((3600, 'hour'), (60, 'minute'))
+
+# pairwise_overlap hands matrices with more cells than this to the compiled kernel
+_PAIRWISE_COMPILED_MIN = 1_000_000
+_PAIRWISE_TILE = 64
+
+# datetime.fromisoformat accepts a trailing 'Z' from Python 3.11
+_ISO_PARSES_Z = sys.version_info >= (3, 11)
+
+@lru_cache(maxsize=4096)
+def _mmss(total_seconds: int) -> str:
+    """MM:SS for a whole number of seconds; cached since timelines repeat the same ticks"""
+    minutes, secs = divmod(total_seconds, 60)
+    return f"{minutes:02d}:{secs:02d}"
+
+@lru_cache(maxsize=4096)
+def _hhmmss(total_seconds: int) -> str:
+    """HH:MM:SS (or MM:SS under an hour) for a whole number of seconds"""
+    hours, remainder = divmod(total_seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
+    
+    if hours > 0:
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+    else:
+        return f"{minutes:02d}:{secs:02d}"
+
+def _pairwise_overlap_tiled(starts_a, ends_a, starts_b, ends_b):
+    """Overlap matrix filled in square tiles so both ranges' bounds stay in L1; row tiles run in parallel"""
+    n = starts_a.shape[0]
+    m = starts_b.shape[0]
+    out = np.empty((n, m))
+    
+    for tile_row in _prange((n + _PAIRWISE_TILE - 1) // _PAIRWISE_TILE):
+        i0 = tile_row * _PAIRWISE_TILE
+        i1 = min(i0 + _PAIRWISE_TILE, n)
+        for j0 in range(0, m, _PAIRWISE_TILE):
+            j1 = min(j0 + _PAIRWISE_TILE, m)
+            for i in range(i0, i1):
+                for j in range(j0, j1):
+                    overlap = min(ends_a[i], ends_b[j]) - max(starts_a[i], starts_b[j])
+                    out[i, j] = overlap if overlap > 0.0 else 0.0
+    
+    return out
+
+if numba is not None:
+    _prange = numba.prange
+    _pairwise_overlap_compiled = numba.njit(parallel=True, fastmath=True, cache=True)(_pairwise_overlap_tiled)
+else:
+    _prange = range
+    _pairwise_overlap_compiled = None
+
+@lru_cache(maxsize=1)
+def _iso_second(epoch_second: int) -> str:
+    """Local ISO timestamp for a whole epoch second; only the current second is kept"""
+    return datetime.fromtimestamp(epoch_second).isoformat()
 
 class TimeUtils:
     """Utility functions for time formatting and conversion"""
@@ -8,33 +80,27 @@ class TimeUtils:
     @staticmethod
     def seconds_to_mmss(seconds: float) -> str:
         """Convert seconds to MM:SS format"""
-        minutes = int(seconds // 60)
-        secs = int(seconds % 60)
-        return f"{minutes:02d}:{secs:02d}"
+        # Floor to whole seconds so the cache is keyed by ints, not arbitrary floats
+        return _mmss(math.floor(seconds))
     
     @staticmethod
     def seconds_to_hhmmss(seconds: float) -> str:
         """Convert seconds to HH:MM:SS format"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        
-        if hours > 0:
-            return f"{hours:02d}:{minutes:02d}:{secs:02d}"
-        else:
-            return f"{minutes:02d}:{secs:02d}"
+        return _hhmmss(math.floor(seconds))
     
     @staticmethod
     def mmss_to_seconds(time_str: str) -> float:
         """Convert MM:SS or HH:MM:SS format to seconds"""
-        parts = time_str.split(':')
-        
-        if len(parts) == 2:  # MM:SS
-            minutes, seconds = map(int, parts)
-            return minutes * 60 + seconds
-        elif len(parts) == 3:  # HH:MM:SS
-            hours, minutes, seconds = map(int, parts)
-            return hours * 3600 + minutes * 60 + seconds
+        # partition() hands int() the same fields as split() without building a list and map iterator
+        colons = time_str.count(':')
+        
+        if colons == 1:  # MM:SS
+            minutes, _, seconds = time_str.partition(':')
+            return int(minutes) * 60 + int(seconds)
+        elif colons == 2:  # HH:MM:SS
+            hours, _, rest = time_str.partition(':')
+            minutes, _, seconds = rest.partition(':')
+            return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
         else:
             raise ValueError("Invalid time format. Use MM:SS or HH:MM:SS")
     
@@ -54,7 +120,11 @@ class TimeUtils:
     @staticmethod
     def get_timestamp() -> str:
         """Get current timestamp in ISO format"""
-        return datetime.now().isoformat()
+        # Same output as datetime.now().isoformat(), but the datetime is built once per second
+        epoch_second, microsecond = divmod(time.time_ns() // 1000, 1_000_000)
+        if microsecond:
+            return f"{_iso_second(epoch_second)}.{microsecond:06d}"
+        return _iso_second(epoch_second)
     
     @staticmethod
     def get_formatted_timestamp(format_str: str = "%Y-%m-%d %H:%M:%S") -> str:
@@ -65,24 +135,28 @@ class TimeUtils:
     def time_ago(timestamp: Union[str, datetime]) -> str:
         """Get human readable time ago string"""
         if isinstance(timestamp, str):
-            timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+            if not _ISO_PARSES_Z:
+                timestamp = timestamp.replace('Z', '+00:00')
+            timestamp = datetime.fromisoformat(timestamp)
         
         now = datetime.now()
         if timestamp.tzinfo is not None:
             now = now.replace(tzinfo=timestamp.tzinfo)
         
         diff = now - timestamp
+        days, seconds = diff.days, diff.seconds
         
-        if diff.days > 0:
-            return f"{diff.days} day{'s' if diff.days != 1 else ''} ago"
-        elif diff.seconds > 3600:
-            hours = diff.seconds // 3600
-            return f"{hours} hour{'s' if hours != 1 else ''} ago"
-        elif diff.seconds > 60:
-            minutes = diff.seconds // 60
-            return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
+        if days > 0:
+            count, name = days, 'day'
         else:
-            return "Just now"
+            for unit_seconds, name in _TIME_AGO_UNITS:
+                if seconds > unit_seconds:
+                    count = seconds // unit_seconds
+                    break
+            else:
+                return "Just now"
+        
+        return f"{count} {name}{('', 's')[count != 1]} ago"
     
     @staticmethod
     def estimate_processing_time(file_size_mb: float, complexity_factor: float = 1.0) -> int:
@@ -104,6 +178,11 @@ class TimeUtils:
         if num_segments <= 0:
             return []
         
+        # Many segments: build all boundaries in one call and pair neighbours
+        if num_segments >= _RANGES_VECTORIZE_MIN:
+            edges = np.linspace(start_time, end_time, num_segments + 1).tolist()
+            return list(zip(edges[:-1], edges[1:]))
+        
         duration = end_time - start_time
         segment_duration = duration / num_segments
         
@@ -129,12 +208,38 @@ class TimeUtils:
         else:
             return 0.0
     
+    @staticmethod
+    def pairwise_overlap(ranges_a, ranges_b) -> np.ndarray:
+        """Overlap duration between every range in ranges_a and every range in ranges_b, as an (N, M) array"""
+        a = np.asarray(ranges_a, dtype=np.float64).reshape(-1, 2)
+        b = np.asarray(ranges_b, dtype=np.float64).reshape(-1, 2)
+        
+        if _pairwise_overlap_compiled is not None and a.shape[0] * b.shape[0] > _PAIRWISE_COMPILED_MIN:
+            return _pairwise_overlap_compiled(
+                np.ascontiguousarray(a[:, 0]), np.ascontiguousarray(a[:, 1]),
+                np.ascontiguousarray(b[:, 0]), np.ascontiguousarray(b[:, 1])
+            )
+        
+        starts = np.maximum(a[:, None, 0], b[None, :, 0])
+        ends = np.minimum(a[:, None, 1], b[None, :, 1])
+        return np.clip(ends - starts, 0.0, None)
+    
     @staticmethod
     def merge_overlapping_ranges(ranges: list, min_gap: float = 1.0) -> list:
         """Merge overlapping or close time ranges"""
         if not ranges:
             return []
         
+        # Large well-formed inputs: a running max of end times marks where each merged group starts
+        if len(ranges) >= _MERGE_VECTORIZE_MIN and min_gap >= 0:
+            bounds = np.asarray(ranges, dtype=np.float64)
+            if bounds.ndim == 2 and bounds.shape[1] == 2 and (bounds[:, 1] >= bounds[:, 0]).all():
+                bounds = bounds[np.argsort(bounds[:, 0], kind='stable')]
+                reach = np.maximum.accumulate(bounds[:, 1])
+                group_starts = np.flatnonzero(np.concatenate(([True], bounds[1:, 0] > reach[:-1] + min_gap)))
+                merged_ends = np.maximum.reduceat(bounds[:, 1], group_starts)
+                return list(zip(bounds[group_starts, 0].tolist(), merged_ends.tolist()))
+        
         # Sort ranges by start time
         sorted_ranges = sorted(ranges, key=lambda x: x[0])
         merged = [sorted_ranges[0]]